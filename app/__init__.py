@@ -7,6 +7,9 @@ from .blueprints.customers import customers_bp
 from .blueprints.mechanics import mechanics_bp
 from .blueprints.service_tickets import service_tickets_bp
 from .blueprints.inventories import inventories_bp
+from .blueprints.internal import internal_bp
+from .utils.compression import compress_response
+from .utils.db_pool import init_pool
 from flask_swagger_ui import get_swaggerui_blueprint
 
 SWAGGER_URL = "/api/docs"  # URL for exposing Swagger UI (without trailing '/')
@@ -24,6 +27,7 @@ def create_app(config_name):
     # initialize extensions
     ma.init_app(app)
     db.init_app(app)
+    init_pool(app)
     limiter.init_app(app)
     cache.init_app(app)
 
@@ -35,5 +39,9 @@ def create_app(config_name):
     app.register_blueprint(mechanics_bp, url_prefix="/mechanics")
     app.register_blueprint(service_tickets_bp, url_prefix="/service_tickets")
     app.register_blueprint(inventories_bp, url_prefix="/inventories")
+    app.register_blueprint(internal_bp, url_prefix="/internal")
+
+    # gzip/brotli for JSON responses the client accepts it for
+    app.after_request(compress_response)
 
     return app
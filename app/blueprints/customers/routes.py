@@ -1,11 +1,36 @@
-from .schemas import customer_schema, customers_schema, login_schema
-from app.blueprints.service_tickets.schemas import service_tickets_schema
-from flask import request, jsonify
+from .schemas import (
+    customer_schema,
+    customers_schema,
+    customer_serializer,
+    customers_serializer,
+    login_schema,
+)
+from app.blueprints.service_tickets.schemas import service_tickets_serializer
+import math
+from flask import current_app, request, jsonify
 from marshmallow import ValidationError
-from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, select
 from app.models import Customer, ServiceTicket, db
 from . import customers_bp
+from app.extensions import cache
+from app.functions import integrity_error_messages
 from app.utils.utils import encode_token, token_required
+from app.utils.fieldsets import column_options, requested_fields
+from app.utils.pagination import get_limit
+from app.utils.response_cache import cached_response, get_or_compute
+from app.utils.serializers import json_response
+
+CUSTOMER_COUNT_KEY = "customers:count"
+
+
+def get_customer_count():
+    """Total number of customers, cached so listings don't COUNT(*) every call."""
+    return get_or_compute(
+        CUSTOMER_COUNT_KEY,
+        lambda: db.session.scalar(select(func.count()).select_from(Customer)),
+        current_app.config.get("CUSTOMER_COUNT_TIMEOUT", 60),
+    )
 
 
 @customers_bp.route("/login", methods=["POST"])
@@ -44,46 +69,98 @@ def create_customer():
         new_customer = Customer(**customer_data)
         db.session.add(new_customer)
         db.session.commit()
+        cache.delete(CUSTOMER_COUNT_KEY)
         return customer_schema.jsonify(new_customer), 201
     except ValidationError as e:
         return jsonify(e.messages), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify(integrity_error_messages(e, Customer, customer_data)), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
 
 
 @customers_bp.route("/", methods=["GET"])
+@cached_response("customers")
 def get_customers():
+    fields = requested_fields(customers_schema)
+
+    # Keyset mode: ?after=<id>&limit= skips OFFSET entirely
+    if "after" in request.args:
+        return get_customers_after(fields)
+
     page = request.args.get("page", default=1, type=int)
     per_page = request.args.get("per_page", default=10, type=int)
 
-    # Use pagination
-    pagination = db.paginate(select(Customer), page=page, per_page=per_page)
+    # Use pagination, the total comes from the cached count
+    pagination = db.paginate(
+        select(Customer)
+        .order_by(Customer.id)
+        .options(*column_options(Customer, fields)),
+        page=page,
+        per_page=per_page,
+        count=False,
+    )
     customers = pagination.items
 
     if len(customers) < 1:
         return jsonify({"message": "There are no customers in the system."}), 200
 
-    return (
-        jsonify(
-            {
-                "total": pagination.total,
-                "page": pagination.page,
-                "pages": pagination.pages,
-                "per_page": pagination.per_page,
-                "customers": customers_schema.dump(customers),
-            }
-        ),
-        200,
+    total = get_customer_count()
+
+    return json_response(
+        {
+            "total": total,
+            "page": pagination.page,
+            "pages": math.ceil(total / pagination.per_page),
+            "per_page": pagination.per_page,
+            "customers": customers_serializer.only(fields).dump(customers),
+        }
+    )
+
+
+def get_customers_after(fields):
+    after = request.args.get("after", default=0, type=int)
+    limit = get_limit()
+
+    query = (
+        select(Customer)
+        .where(Customer.id > after)
+        .order_by(Customer.id)
+        .limit(limit + 1)
+        .options(*column_options(Customer, fields))
+    )
+    customers = db.session.execute(query).scalars().all()
+
+    if len(customers) < 1 and not after:
+        return jsonify({"message": "There are no customers in the system."}), 200
+
+    has_more = len(customers) > limit
+    customers = customers[:limit]
+    total = get_customer_count()
+
+    return json_response(
+        {
+            "total": total,
+            "pages": math.ceil(total / limit),
+            "limit": limit,
+            "next_after": customers[-1].id if has_more else None,
+            "customers": customers_serializer.only(fields).dump(customers),
+        }
     )
 
 
 @customers_bp.route("/<int:customer_id>", methods=["GET"])
+@cached_response("customers")
 def get_customer(customer_id):
-    customer = db.session.get(Customer, customer_id)
+    fields = requested_fields(customer_schema)
+    customer = db.session.get(
+        Customer, customer_id, options=column_options(Customer, fields)
+    )
 
     if customer:
-        return customer_schema.jsonify(customer), 200
+        return customer_serializer.only(fields).jsonify(customer)
     return jsonify({"error": "Customer not found."}), 404
 
 
@@ -95,7 +172,7 @@ def get_my_tickets(user, user_role):
     if len(service_tickets) < 1:
         return jsonify({"message": "You have no service tickets"})
 
-    return service_tickets_schema.jsonify(service_tickets), 200
+    return service_tickets_serializer.jsonify(service_tickets)
 
 
 @customers_bp.route("/", methods=["PUT"])
@@ -109,13 +186,20 @@ def update_customer(user, user_role):
         return customer_schema.jsonify(user), 200
     except ValidationError as e:
         return jsonify(e.messages), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        return (
+            jsonify(integrity_error_messages(e, Customer, data, user.id)),
+            400,
+        )
 
 
 @customers_bp.route("/", methods=["DELETE"])
 @token_required
 def delete_customer(user, user_role):
-    db.session.delete(user)
+    db.session.delete(user.load())
     db.session.commit()
+    cache.delete(CUSTOMER_COUNT_KEY)
     return (
         jsonify({"message": f"Customer id: {user.id}, successfully deleted"}),
         200,
@@ -1,5 +1,6 @@
 from marshmallow import pre_load, validates
 from app.extensions import ma
+from app.utils.serializers import CompiledSerializer
 from app.models import Customer
 from app.functions import (
     strip_input,
@@ -34,16 +35,18 @@ class CustomerSchema(ma.SQLAlchemyAutoSchema):
         # use getattr to prevent AttributeError if context is missing
         ctx = getattr(self, "context", {}) or {}
         if not ctx.get("login", False):
-            return validate_email(Customer, value)
+            return validate_email(value)
         return value
 
     @validates("phone")
     def check_phone(self, value, **kwargs):
-        return validate_phone(Customer, value)
+        return validate_phone(value)
 
 
 customer_schema = CustomerSchema()
 customers_schema = CustomerSchema(many=True)
+customer_serializer = CompiledSerializer(customer_schema)
+customers_serializer = CompiledSerializer(customers_schema)
 login_schema = CustomerSchema(exclude=["name", "phone"])
 login_schema.context = {"login": True}
 
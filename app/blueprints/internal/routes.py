@@ -0,0 +1,30 @@
+import hmac
+from flask import current_app, jsonify, request
+from app.extensions import limiter
+from app.utils.db_pool import pool_metrics
+from app.utils.utils import token_version_cache, verified_token_cache
+from . import internal_bp
+
+
+@internal_bp.route("/metrics", methods=["GET"])
+@limiter.exempt
+def get_metrics():
+    """
+    Connection pool and in-process cache counters of this worker, for
+    monitoring. Send INTERNAL_METRICS_TOKEN as a bearer token.
+    """
+    token = current_app.config.get("INTERNAL_METRICS_TOKEN")
+    if not token:
+        return jsonify({"error": "Not found"}), 404
+
+    auth_header = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(auth_header.encode(), f"Bearer {token}".encode()):
+        return jsonify({"message": "Invalid metrics token"}), 401
+
+    return jsonify(
+        {
+            "db_pools": pool_metrics(),
+            "token_version_cache": token_version_cache.stats(),
+            "verified_token_cache": verified_token_cache.stats(),
+        }
+    )
@@ -0,0 +1,135 @@
+# app/blueprints/inventories/importer.py
+import csv
+import io
+import json
+from itertools import islice
+from marshmallow import ValidationError
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from app.models import Inventory, db
+from .schemas import import_inventory_schema
+
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 100
+
+
+def iter_csv_rows(stream):
+    """Yield (line number, row dict) from a binary CSV stream with a header row"""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8", newline=""))
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(stream):
+    """Yield (line number, row) from a binary stream of one JSON object per line"""
+    for line_num, line in enumerate(io.TextIOWrapper(stream, encoding="utf-8"), 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_num, json.loads(line)
+        except ValueError:
+            yield line_num, None
+
+
+ROW_READERS = {"csv": iter_csv_rows, "ndjson": iter_ndjson_rows}
+
+
+def import_parts(rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Upsert inventory parts from (line number, row) pairs, chunk_size rows at a time.
+    Parts are matched on part_name, existing parts get the new price and quantity.
+    Only one chunk is held in memory and each chunk is committed on its own.
+    """
+    result = {"inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    rows = iter(rows)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        _import_chunk(chunk, result)
+
+    return result
+
+
+def _record_error(result, line, messages):
+    result["failed"] += 1
+    if len(result["errors"]) < MAX_REPORTED_ERRORS:
+        result["errors"].append({"line": line, "errors": messages})
+
+
+def _name_key(part_name):
+    # MySQL's default collation compares part names case-insensitively,
+    # "brake pad" is the same part as "Brake Pad"
+    return part_name.casefold()
+
+
+def _import_chunk(chunk, result):
+    # Validate every row, a later row for the same part_name wins
+    parts = {}
+    for line, row in chunk:
+        if not isinstance(row, dict):
+            _record_error(result, line, {"_schema": ["Invalid row."]})
+            continue
+        try:
+            data = import_inventory_schema.load(row)
+        except ValidationError as e:
+            _record_error(result, line, e.messages)
+            continue
+        parts[_name_key(data["part_name"])] = (line, data)
+
+    if not parts:
+        return
+
+    # One IN query per chunk decides insert vs update
+    names = [data["part_name"] for _, data in parts.values()]
+    existing = {
+        _name_key(name): part_id
+        for name, part_id in db.session.execute(
+            select(Inventory.part_name, Inventory.id).where(
+                Inventory.part_name.in_(names)
+            )
+        )
+    }
+    new_parts = [
+        (line, data) for key, (line, data) in parts.items() if key not in existing
+    ]
+    changed_parts = [
+        (line, {"id": existing[key], **data})
+        for key, (line, data) in parts.items()
+        if key in existing
+    ]
+
+    try:
+        if new_parts:
+            db.session.execute(insert(Inventory), [data for _, data in new_parts])
+        if changed_parts:
+            db.session.execute(update(Inventory), [data for _, data in changed_parts])
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        # e.g. a part created since the lookup, find the rows at fault
+        # instead of failing the whole chunk
+        _import_rows(new_parts, changed_parts, result)
+        return
+
+    result["inserted"] += len(new_parts)
+    result["updated"] += len(changed_parts)
+
+
+def _import_rows(new_parts, changed_parts, result):
+    """Write a failed chunk's rows one at a time, each committed on its own"""
+    for statement, rows, counter in (
+        (insert(Inventory), new_parts, "inserted"),
+        (update(Inventory), changed_parts, "updated"),
+    ):
+        for line, data in rows:
+            try:
+                db.session.execute(statement, [data])
+                db.session.commit()
+            except IntegrityError as e:
+                db.session.rollback()
+                _record_error(result, line, {"_schema": [str(e.orig)]})
+            else:
+                result[counter] += 1
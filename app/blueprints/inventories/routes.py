@@ -1,11 +1,21 @@
+import io
 from flask import request, jsonify
 from marshmallow import ValidationError
 from sqlalchemy import select
 
 from app.models import db, Inventory
-from .schemas import InventorySchema, inventory_schema, inventories_schema
+from .schemas import (
+    InventorySchema,
+    inventory_schema,
+    inventories_schema,
+    inventory_serializer,
+    inventories_serializer,
+)
+from .importer import ROW_READERS, import_parts
 from . import inventories_bp
 from app.utils.utils import encode_token, token_required, roles_required
+from app.utils.fieldsets import column_options, requested_fields
+from app.utils.response_cache import cached_response
 
 
 @inventories_bp.route("/", methods=["POST"])
@@ -24,21 +34,54 @@ def create_part(user, user_role):
     return inventory_schema.jsonify(part), 201
 
 
+IMPORT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@inventories_bp.route("/import", methods=["POST"])
+@token_required
+@roles_required("mechanic")
+def import_inventory_parts(user, user_role):
+    """
+    Stream a supplier catalog into the inventory.
+    Send CSV (header: part_name,price,quantity) as text/csv or one JSON
+    object per line as application/x-ndjson. Parts are upserted by part_name.
+    """
+    file_format = IMPORT_FORMATS.get(request.mimetype)
+    if file_format is None:
+        return (
+            jsonify({"error": "Content-Type must be text/csv or application/x-ndjson"}),
+            415,
+        )
+
+    # Read the body incrementally instead of buffering the whole upload
+    rows = ROW_READERS[file_format](io.BufferedReader(request.stream))
+    return jsonify(import_parts(rows)), 200
+
+
 @inventories_bp.route("/", methods=["GET"])
+@cached_response("inventories")
 def get_parts():
-    parts = db.session.query(Inventory).all()
+    fields = requested_fields(inventories_schema)
+    query = select(Inventory).options(*column_options(Inventory, fields))
+    parts = db.session.execute(query).scalars().all()
     if len(parts) < 1:
         return jsonify({"message": "There are no parts in the system."}), 200
-    return inventories_schema.jsonify(parts), 200
+    return inventories_serializer.only(fields).jsonify(parts)
 
 
 @inventories_bp.route("/<int:part_id>", methods=["GET"])
+@cached_response("inventories")
 def get_part(part_id):
-    part = db.session.get(Inventory, part_id)
+    fields = requested_fields(inventory_schema)
+    part = db.session.get(Inventory, part_id, options=column_options(Inventory, fields))
 
     if not part:
         return jsonify({"message": "Invalid part id"}), 404
-    return inventory_schema.jsonify(part), 200
+    return inventory_serializer.only(fields).jsonify(part)
 
 
 @inventories_bp.route("/<int:part_id>", methods=["PUT"])
@@ -1,5 +1,7 @@
 from marshmallow import ValidationError, pre_load, validates, validates_schema
 from app.extensions import ma
+from app.utils.serializers import CompiledSerializer
+from app.utils.validators import CompiledValidator
 from app.models import InventoryServiceTicket, Inventory, db
 from app.functions import (
     strip_input,
@@ -17,6 +19,11 @@ class InventorySchema(ma.SQLAlchemyAutoSchema):
 
     @validates("part_name")
     def validate_part_name(self, value):
+        # Imports match part names against the database a chunk at a time
+        ctx = getattr(self, "context", {}) or {}
+        if ctx.get("import", False):
+            return validate_name(value)
+
         # Access the current part_id if set by the route
         part_id = getattr(self, "_current_part_id", None)
 
@@ -71,6 +78,14 @@ class InventoryServiceTicketSchema(ma.SQLAlchemySchema):
 
 inventory_schema = InventorySchema()
 inventories_schema = InventorySchema(many=True)
+inventory_serializer = CompiledSerializer(inventory_schema)
+inventories_serializer = CompiledSerializer(inventories_schema)
+import_inventory_schema = InventorySchema(exclude=["id"])
+import_inventory_schema.context = {"import": True}
 
 inventory_service_ticket_schema = InventoryServiceTicketSchema()
 inventories_service_ticket_schema = InventoryServiceTicketSchema(many=True)
+inventory_service_ticket_validator = CompiledValidator(inventory_service_ticket_schema)
+inventories_service_ticket_validator = CompiledValidator(
+    inventories_service_ticket_schema
+)
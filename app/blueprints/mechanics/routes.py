@@ -1,12 +1,22 @@
-from .schemas import mechanic_schema, mechanics_schema, login_schema
-from app.blueprints.service_tickets.schemas import service_tickets_schema
+from .schemas import (
+    mechanic_schema,
+    mechanics_schema,
+    mechanic_serializer,
+    mechanics_serializer,
+    login_schema,
+)
+from app.blueprints.service_tickets.schemas import service_tickets_serializer
 from flask import request, jsonify
 from marshmallow import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select
 from app.models import Mechanic, db, ServiceTicket
 from . import mechanics_bp
-from app.extensions import limiter, cache
+from app.extensions import limiter
+from app.functions import integrity_error_messages
 from app.utils.utils import encode_token, token_required, roles_required
+from app.utils.fieldsets import column_options, requested_fields
+from app.utils.response_cache import cached_response
 
 
 @mechanics_bp.route("/login", methods=["POST"])
@@ -48,6 +58,9 @@ def create_mechanic():
         return mechanic_schema.jsonify(new_mechanic), 201
     except ValidationError as e:
         return jsonify(e.messages), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify(integrity_error_messages(e, Mechanic, mechanic_data)), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 400
@@ -55,25 +68,29 @@ def create_mechanic():
 
 @mechanics_bp.route("/", methods=["GET"])
 @limiter.limit("100 per minute")
-# @cache.cached(timeout=300)
+@cached_response("mechanics")
 def get_mechanics():
-    query = select(Mechanic)
+    fields = requested_fields(mechanics_schema)
+    query = select(Mechanic).options(*column_options(Mechanic, fields))
     mechanics = db.session.execute(query).scalars().all()
 
     if len(mechanics) < 1:
         return jsonify({"message": "There are no mechanics in the system."}), 200
 
-    return mechanics_schema.jsonify(mechanics)
+    return mechanics_serializer.only(fields).jsonify(mechanics)
 
 
 @mechanics_bp.route("/<int:mechanic_id>", methods=["GET"])
 @limiter.limit("100 per minute")
-@cache.cached(timeout=300)
+@cached_response("mechanics")
 def get_mechanic(mechanic_id):
-    mechanic = db.session.get(Mechanic, mechanic_id)
+    fields = requested_fields(mechanic_schema)
+    mechanic = db.session.get(
+        Mechanic, mechanic_id, options=column_options(Mechanic, fields)
+    )
 
     if mechanic:
-        return mechanic_schema.jsonify(mechanic), 200
+        return mechanic_serializer.only(fields).jsonify(mechanic)
     return jsonify({"error": "Mechanic not found."}), 404
 
 
@@ -86,7 +103,7 @@ def get_mechanics_my_tickets(user, user_role):
     if len(service_tickets) < 1:
         return jsonify({"message": "You have no service tickets"}), 200
 
-    return service_tickets_schema.jsonify(service_tickets), 200
+    return service_tickets_serializer.jsonify(service_tickets)
 
 
 @mechanics_bp.route("/", methods=["PUT"])
@@ -102,6 +119,12 @@ def update_mechanic(user, user_role):
         return mechanic_schema.jsonify(user), 200
     except ValidationError as e:
         return jsonify(e.messages), 400
+    except IntegrityError as e:
+        db.session.rollback()
+        return (
+            jsonify(integrity_error_messages(e, Mechanic, data, user.id)),
+            400,
+        )
 
 
 @mechanics_bp.route("/", methods=["DELETE"])
@@ -124,7 +147,7 @@ def delete_mechanic(user, user_role):
             )
 
     # Safe to delete
-    db.session.delete(user)
+    db.session.delete(user.load())
     db.session.commit()
     return (
         jsonify({"message": f"Mechanic id: {user.id}, successfully deleted"}),
@@ -1,5 +1,6 @@
 from marshmallow import pre_load, validates
 from app.extensions import ma
+from app.utils.serializers import CompiledSerializer
 from app.models import Mechanic
 from app.functions import (
     strip_input,
@@ -34,17 +35,19 @@ class MechanicSchema(ma.SQLAlchemyAutoSchema):
     def check_email(self, value, **kwargs):
         ctx = getattr(self, "context", {}) or {}
         if not ctx.get("login", False):
-            return validate_email(Mechanic, value)
+            return validate_email(value)
         return value
         # Prevents AttributeError if the schema context is missing.
         # Only enforces stricter email checks when creating or updating a customer, not when logging in.
 
     @validates("phone")
     def check_phone(self, value, **kwargs):
-        return validate_phone(Mechanic, value)
+        return validate_phone(value)
 
 
 mechanic_schema = MechanicSchema()
 mechanics_schema = MechanicSchema(many=True)
+mechanic_serializer = CompiledSerializer(mechanic_schema)
+mechanics_serializer = CompiledSerializer(mechanics_schema)
 login_schema = MechanicSchema(exclude=["name", "phone", "salary"])
 login_schema.context = {"login": True}
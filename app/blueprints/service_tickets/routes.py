@@ -1,27 +1,55 @@
 # app/blueprints/service_tickets/routes.py
-from flask import request, jsonify
+from datetime import date
+from flask import Response, request, jsonify, stream_with_context
 from marshmallow import ValidationError
-from sqlalchemy import select
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.orm import selectinload
 from app.models import (
     Inventory,
     InventoryServiceTicket,
     Mechanic,
     ServiceTicket,
     db,
+    service_mechanics,
 )
 from . import service_tickets_bp
 from .schemas import (
+    DATE_REGEX,
+    VIN_PREFIX_REGEX,
+    VIN_REGEX,
     service_ticket_schema,
     service_tickets_schema,
-    edit_service_ticket_mechanics_schema,
-    edit_service_ticket_info_schema,
+    service_ticket_serializer,
+    service_tickets_serializer,
+    service_ticket_validator,
+    edit_service_ticket_info_validator,
+    edit_service_ticket_mechanics_validator,
 )
-from app.blueprints.mechanics.schemas import mechanics_schema
+from app.blueprints.mechanics.schemas import mechanic_serializer
 from app.utils.utils import token_required, roles_required
+from app.utils.fieldsets import column_options, requested_fields
+from app.utils.pagination import get_limit
+from app.utils.loaders import get_loader
+from app.utils.response_cache import cached_response
+from app.utils.serializers import dumps, json_response
+from .search import search_query, search_terms
+from .stock import add_used_parts, remove_used_parts, return_stock, take_stock
 from app.blueprints.inventories.schemas import (
-    inventory_service_ticket_schema,
+    inventory_service_ticket_validator,
+    inventories_service_ticket_validator,
 )
 
+# Nested collections dumped by ServiceTicketSchema, loaded with one
+# IN query each instead of one lazy load per ticket
+TICKET_RELATIONSHIP_LOADS = {
+    "mechanics": selectinload(ServiceTicket.mechanics),
+    "inventory_links": selectinload(ServiceTicket.inventory_links),
+}
+TICKET_LOAD_OPTIONS = tuple(TICKET_RELATIONSHIP_LOADS.values())
+
+BULK_MAX_TICKETS = 500
+EXPORT_BATCH_SIZE = 1000
+
 
 @service_tickets_bp.route("/", methods=["POST"])
 @token_required
@@ -39,16 +67,15 @@ def create_service_ticket(user, user_role):
     }
     """
     try:
-        ticket_data = service_ticket_schema.load(request.json)
+        ticket_data = service_ticket_validator.load(request.json)
 
         mechanic_ids = ticket_data.pop("mechanic_ids", [])
         new_ticket = ServiceTicket(**ticket_data)
 
-        mechanics = (
-            db.session.query(Mechanic).filter(Mechanic.id.in_(mechanic_ids)).all()
-        )
+        # Already fetched while validating mechanic_ids
+        mechanics = get_loader(Mechanic).load_many(mechanic_ids)
 
-        new_ticket.mechanics = mechanics
+        new_ticket.mechanics = list(mechanics.values())
 
         db.session.add(new_ticket)
         db.session.commit()
@@ -61,117 +88,509 @@ def create_service_ticket(user, user_role):
         return jsonify({"error": str(e)}), 400
 
 
+@service_tickets_bp.route("/bulk", methods=["POST"])
+@token_required
+@roles_required(["mechanic"])
+def create_service_tickets_bulk(user, user_role):
+    """
+    Create many service tickets in one transaction.
+    Example request JSON:
+    [
+        {
+            "customer_id": 1,
+            "VIN": "1HGCM82633A123456",
+            "service_date": "2025-12-12",
+            "service_desc": "Oil change",
+            "mechanic_ids": [1, 2]
+        },
+        ...
+    ]
+    Nothing is saved unless every ticket is valid, errors are keyed by
+    the ticket's index in the request.
+    """
+    payload = request.json
+    if not isinstance(payload, list) or len(payload) < 1:
+        return (
+            jsonify({"error": "Request body must be a non-empty list of tickets"}),
+            400,
+        )
+    if len(payload) > BULK_MAX_TICKETS:
+        return (
+            jsonify({"error": f"At most {BULK_MAX_TICKETS} tickets per request"}),
+            400,
+        )
+
+    # Every referenced customer and mechanic is checked with one IN query
+    # per model once the rest of each ticket is validated
+    tickets_data, errors = service_ticket_validator.load_batch(payload)
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    try:
+        mechanic_ids = [data.pop("mechanic_ids", []) for data in tickets_data]
+        tickets = [ServiceTicket(**data) for data in tickets_data]
+
+        # The tickets' ids come back from RETURNING in batched INSERTs on
+        # PostgreSQL, SQLite and MariaDB. MySQL has no RETURNING, so there
+        # SQLAlchemy sends one INSERT per ticket to read each lastrowid.
+        # The links are one executemany on every database.
+        db.session.add_all(tickets)
+        db.session.flush()
+        ticket_ids = [ticket.id for ticket in tickets]
+        db.session.execute(
+            insert(service_mechanics),
+            [
+                {"service_ticket_id": ticket_id, "mechanic_id": mechanic_id}
+                for ticket_id, ids in zip(ticket_ids, mechanic_ids)
+                for mechanic_id in dict.fromkeys(ids)
+            ],
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
+    query = (
+        select(ServiceTicket)
+        .where(ServiceTicket.id.in_(ticket_ids))
+        .order_by(ServiceTicket.id)
+        .options(*TICKET_LOAD_OPTIONS)
+    )
+    created = db.session.execute(query).scalars().all()
+
+    return (
+        jsonify(
+            {
+                "created": len(created),
+                "service_tickets": service_tickets_schema.dump(created),
+            }
+        ),
+        201,
+    )
+
+
 @service_tickets_bp.route("/", methods=["GET"])
 @token_required
+@cached_response("service_tickets", "mechanics")
 def get_service_tickets(user, user_role):
-    tickets = db.session.execute(select(ServiceTicket)).scalars().all()
+    """
+    Service tickets ordered by id. Pass the returned next_after_id
+    as ?after_id= to get the next page.
+    Optional filters: ?from=&to= (YYYY-MM-DD, inclusive), ?mechanic_id=, ?customer_id=
+    """
+    limit = get_limit()
+    fields = requested_fields(service_tickets_schema)
+    after_id = request.args.get("after_id", default=0, type=int)
+    mechanic_id = request.args.get("mechanic_id", type=int)
+    customer_id = request.args.get("customer_id", type=int)
 
-    if len(tickets) < 1:
+    try:
+        date_from = _date_arg("from")
+        date_to = _date_arg("to")
+    except ValueError:
+        return jsonify({"error": "from and to must be in format YYYY-MM-DD"}), 400
+
+    query = select(ServiceTicket).where(ServiceTicket.id > after_id)
+    # Each filter is served by its own index, see models.py
+    if date_from:
+        query = query.where(ServiceTicket.service_date >= date_from)
+    if date_to:
+        query = query.where(ServiceTicket.service_date <= date_to)
+    if customer_id is not None:
+        query = query.where(ServiceTicket.customer_id == customer_id)
+    if mechanic_id is not None:
+        query = query.join(service_mechanics).where(
+            service_mechanics.c.mechanic_id == mechanic_id
+        )
+    filtered = any(
+        arg in request.args for arg in ("from", "to", "mechanic_id", "customer_id")
+    )
+
+    query = (
+        query.order_by(ServiceTicket.id)
+        .limit(limit + 1)
+        .options(*_ticket_options(fields))
+    )
+    tickets = db.session.execute(query).scalars().all()
+
+    if len(tickets) < 1 and not filtered and not after_id:
         return jsonify({"message": "There are no service ticket in the system."})
-    return service_tickets_schema.jsonify(tickets)
+
+    has_more = len(tickets) > limit
+    tickets = tickets[:limit]
+
+    return json_response(
+        {
+            "limit": limit,
+            "next_after_id": tickets[-1].id if has_more else None,
+            "service_tickets": service_tickets_serializer.only(fields).dump(tickets),
+        }
+    )
+
+
+def _ticket_options(fields, always=()):
+    """Loader options for the ticket columns and collections in fields"""
+    return column_options(ServiceTicket, fields, TICKET_RELATIONSHIP_LOADS, always)
+
+
+def _date_arg(name):
+    """Parse a YYYY-MM-DD query string argument, None if it wasn't passed"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    if not DATE_REGEX.match(value):
+        raise ValueError(value)
+    return date.fromisoformat(value)
+
+
+@service_tickets_bp.route("/export", methods=["GET"])
+@token_required
+def export_service_tickets(user, user_role):
+    """
+    Stream every service ticket as NDJSON, one ticket per line.
+    Tickets are read in keyset batches of EXPORT_BATCH_SIZE, with mechanics
+    and parts loaded per batch, so memory stays constant whether or not
+    the driver can stream a result set.
+    """
+    query = (
+        select(ServiceTicket)
+        .order_by(ServiceTicket.id)
+        .limit(EXPORT_BATCH_SIZE)
+        .options(*TICKET_LOAD_OPTIONS)
+    )
+
+    def generate():
+        last_id = 0
+        while True:
+            batch = (
+                db.session.execute(query.where(ServiceTicket.id > last_id))
+                .scalars()
+                .all()
+            )
+            if not batch:
+                return
+            last_id = batch[-1].id
+            for ticket in service_tickets_serializer.dump(batch):
+                yield dumps(ticket) + b"\n"
+            # The identity map only holds weak references, so each
+            # finished batch is garbage collected
+            del batch
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
 @service_tickets_bp.route("/<int:ticket_id>", methods=["GET"])
 @token_required
+@cached_response("service_tickets", "mechanics")
 def get_service_ticket(user, user_role, ticket_id):
-    ticket = db.session.get(ServiceTicket, ticket_id)
+    fields = requested_fields(service_ticket_schema)
+    ticket = db.session.get(ServiceTicket, ticket_id, options=_ticket_options(fields))
     if not ticket:
         return jsonify({"error": "Service ticket not found."}), 404
-    return service_ticket_schema.jsonify(ticket), 200
+    return service_ticket_serializer.only(fields).jsonify(ticket)
+
+
+@service_tickets_bp.route("/by-vin/<vin>", methods=["GET"])
+@token_required
+@roles_required(["mechanic"])
+@cached_response("service_tickets", "mechanics")
+def get_service_tickets_by_vin(user, user_role, vin):
+    """
+    Service history of a vehicle, newest service date first.
+    A full 17 character VIN matches exactly, 3 to 16 characters match every
+    VIN starting with them. Pass the returned next_cursor
+    ("<service_date>:<ticket_id>") as ?cursor= to get the next page.
+    """
+    limit = get_limit()
+    fields = requested_fields(service_tickets_schema)
+    vin = vin.strip().upper()
+
+    if VIN_REGEX.match(vin):
+        vin_filter = ServiceTicket.VIN == vin
+    elif VIN_PREFIX_REGEX.match(vin):
+        # VINs only hold 0-9 and A-Z, so every VIN with this prefix sorts
+        # between the prefix padded with "0" and padded with "Z"
+        vin_filter = ServiceTicket.VIN.between(vin.ljust(17, "0"), vin.ljust(17, "Z"))
+    else:
+        return (
+            jsonify(
+                {
+                    "error": "Invalid VIN. Must be 17 characters, or the first 3 "
+                    "to 16 characters (letters/digits, no I, O, Q)"
+                }
+            ),
+            400,
+        )
+
+    query = (
+        select(ServiceTicket)
+        .where(vin_filter)
+        .order_by(ServiceTicket.service_date.desc(), ServiceTicket.id.desc())
+        .limit(limit + 1)
+        # The next cursor is built from service_date
+        .options(*_ticket_options(fields, always=("service_date",)))
+    )
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            last_date, _, last_id = cursor.partition(":")
+            last_date, last_id = date.fromisoformat(last_date), int(last_id)
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+        query = query.where(
+            or_(
+                ServiceTicket.service_date < last_date,
+                and_(
+                    ServiceTicket.service_date == last_date,
+                    ServiceTicket.id < last_id,
+                ),
+            )
+        )
+
+    tickets = db.session.execute(query).scalars().all()
+    has_more = len(tickets) > limit
+    tickets = tickets[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = f"{tickets[-1].service_date.isoformat()}:{tickets[-1].id}"
+
+    return json_response(
+        {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "service_tickets": service_tickets_serializer.only(fields).dump(tickets),
+        }
+    )
+
+
+@service_tickets_bp.route("/search", methods=["GET"])
+@token_required
+@roles_required(["mechanic"])
+@cached_response("service_tickets", "mechanics")
+def search_service_tickets(user, user_role):
+    """
+    Full-text search of service descriptions, best match first.
+    Every word in ?q= must appear, words also match as prefixes
+    ("brake pad" finds "front brake pads"). Pages are numbered from 1.
+    """
+    limit = get_limit()
+    page = max(1, request.args.get("page", default=1, type=int))
+    fields = requested_fields(service_tickets_schema)
+
+    terms = search_terms(request.args.get("q", ""))
+    if not terms:
+        return jsonify({"error": "q must contain at least one word"}), 400
+
+    dialect = db.session.get_bind().dialect.name
+    query = (
+        search_query(terms, dialect)
+        .offset((page - 1) * limit)
+        .limit(limit + 1)
+        .options(*_ticket_options(fields))
+    )
+    tickets = db.session.execute(query).scalars().all()
+    has_more = len(tickets) > limit
+    tickets = tickets[:limit]
+
+    return json_response(
+        {
+            "limit": limit,
+            "page": page,
+            "next_page": page + 1 if has_more else None,
+            "service_tickets": service_tickets_serializer.only(fields).dump(tickets),
+        }
+    )
 
 
 @service_tickets_bp.route("/most-tickets", methods=["GET"])
+@cached_response("service_tickets", "mechanics")
 def get_mechanic_with_most_service_tickets():
-    query = select(Mechanic)
-    mechanics = db.session.execute(query).scalars().all()
+    """
+    Mechanics ranked by number of service tickets, most first.
+    Ties are broken by mechanic id. Pass the returned next_cursor
+    ("<ticket_count>:<mechanic_id>") as ?cursor= to get the next page.
+    """
+    limit = get_limit()
+
+    # Count tickets per mechanic once in the database instead of
+    # lazy loading every mechanic's service_tickets
+    counts = (
+        select(
+            service_mechanics.c.mechanic_id,
+            func.count().label("ticket_count"),
+        )
+        .group_by(service_mechanics.c.mechanic_id)
+        .subquery()
+    )
+    ticket_count = func.coalesce(counts.c.ticket_count, 0)
 
-    mechanics.sort(
-        key=lambda mechanic: len(mechanic.service_tickets), reverse=True
-    )  # params:expression
+    query = (
+        select(Mechanic, ticket_count)
+        .outerjoin(counts, counts.c.mechanic_id == Mechanic.id)
+        .order_by(ticket_count.desc(), Mechanic.id.asc())
+        .limit(limit + 1)
+    )
 
-    return mechanics_schema.jsonify(mechanics), 200
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            last_count, last_id = (int(part) for part in cursor.split(":"))
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+
+        query = query.where(
+            or_(
+                ticket_count < last_count,
+                and_(ticket_count == last_count, Mechanic.id > last_id),
+            )
+        )
+
+    rows = db.session.execute(query).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    mechanics = []
+    for mechanic, count in rows:
+        mechanic_data = mechanic_serializer.dump(mechanic)
+        mechanic_data["ticket_count"] = count
+        mechanics.append(mechanic_data)
+
+    next_cursor = None
+    if has_more:
+        last_mechanic, last_count = rows[-1]
+        next_cursor = f"{last_count}:{last_mechanic.id}"
+
+    return json_response(
+        {
+            "limit": limit,
+            "next_cursor": next_cursor,
+            "mechanics": mechanics,
+        }
+    )
 
 
 @service_tickets_bp.route("/<int:ticket_id>/update-parts", methods=["PUT"])
 @token_required
 @roles_required(["mechanic"])
 def update_service_ticket_part(user, user_role, ticket_id):
+    """
+    Add or return parts on a service ticket.
+    Accepts one part change or a list of them, e.g.
+    [
+        {"inventory_id": 1, "quantity_used": 2},
+        {"inventory_id": 4, "quantity_returned": 1}
+    ]
+    All changes are applied in one transaction, if any fails none are saved.
+    """
     try:
         # Load request data with schema
-        ticket_parts_data = inventory_service_ticket_schema.load(request.json)
+        if isinstance(request.json, list):
+            parts_data = inventories_service_ticket_validator.load(request.json)
+        else:
+            parts_data = [inventory_service_ticket_validator.load(request.json)]
+
+        if len(parts_data) < 1:
+            return jsonify({"error": "At least one part change is required"}), 400
 
         service_ticket = db.session.get(ServiceTicket, ticket_id)
         if not service_ticket:
             return jsonify({"error": "Service ticket not found"}), 404
 
-        part = db.session.get(Inventory, ticket_parts_data["inventory_id"])
-        if not part:
+        inventory_ids = [part["inventory_id"] for part in parts_data]
+        if len(set(inventory_ids)) != len(inventory_ids):
             return (
-                jsonify(
-                    {
-                        "error": f"Part id {ticket_parts_data['inventory_id']} does not exist"
-                    }
-                ),
+                jsonify({"error": "Each inventory_id can only be listed once"}),
                 400,
             )
 
-        quantity_used = ticket_parts_data.get("quantity_used", 0)
-        quantity_returned = ticket_parts_data.get("quantity_returned", 0)
-
-        # Find existing inventory link for this ticket
-        inventory_link = next(
-            (
-                link
-                for link in service_ticket.inventory_links
-                if link.inventory_id == part.id
-            ),
-            None,
+        # One query for the parts and one for this ticket's links to them
+        part_names = dict(
+            db.session.execute(
+                select(Inventory.id, Inventory.part_name).where(
+                    Inventory.id.in_(inventory_ids)
+                )
+            ).all()
+        )
+        quantities_used = dict(
+            db.session.execute(
+                select(
+                    InventoryServiceTicket.inventory_id,
+                    InventoryServiceTicket.quantity_used,
+                ).where(
+                    InventoryServiceTicket.service_ticket_id == ticket_id,
+                    InventoryServiceTicket.inventory_id.in_(inventory_ids),
+                )
+            ).all()
         )
 
-        if not inventory_link:
-            inventory_link = InventoryServiceTicket(
-                service_ticket_id=ticket_id,
-                inventory_id=part.id,
-                quantity_used=0,
-            )
-            db.session.add(inventory_link)
-
-        # Handle adding parts
-        if quantity_used > 0:
-            if part.quantity < quantity_used:
+        for part in parts_data:
+            inventory_id = part["inventory_id"]
+            if inventory_id not in part_names:
                 return (
-                    jsonify({"error": f"Not enough {part.part_name}s in inventory"}),
+                    jsonify({"error": f"Part id {inventory_id} does not exist"}),
                     400,
                 )
-            inventory_link.quantity_used += quantity_used
-            part.quantity -= quantity_used
 
-        # Handle removing parts
-        if quantity_returned > 0:
-            if inventory_link.quantity_used < quantity_returned:
+            available = quantities_used.get(inventory_id, 0) + part.get(
+                "quantity_used", 0
+            )
+            if part.get("quantity_returned", 0) > available:
                 return (
                     jsonify(
                         {
-                            "error": f"Cannot return more {part.part_name}s than used in this ticket"
+                            "error": f"Cannot return more {part_names[inventory_id]}s than used in this ticket"
                         }
                     ),
                     400,
                 )
-            inventory_link.quantity_used -= quantity_returned
-            part.quantity += quantity_returned
-
-        db.session.commit()
 
+        # Stock and link rows change with conditional single-statement
+        # updates, so concurrent requests can't oversell or lose an update
         messages = []
-        if quantity_used > 0:
-            messages.append(f"{quantity_used} {part.part_name}(s) added")
-        if quantity_returned > 0:
-            messages.append(f"{quantity_returned} {part.part_name}(s) removed")
+        for part in parts_data:
+            inventory_id = part["inventory_id"]
+            part_name = part_names[inventory_id]
+            quantity_used = part.get("quantity_used", 0)
+            quantity_returned = part.get("quantity_returned", 0)
+
+            # Handle adding parts
+            if quantity_used > 0:
+                if not take_stock(inventory_id, quantity_used):
+                    db.session.rollback()
+                    return (
+                        jsonify({"error": f"Not enough {part_name}s in inventory"}),
+                        400,
+                    )
+                add_used_parts(ticket_id, inventory_id, quantity_used)
+
+            # Handle removing parts
+            if quantity_returned > 0:
+                if not remove_used_parts(ticket_id, inventory_id, quantity_returned):
+                    db.session.rollback()
+                    return (
+                        jsonify(
+                            {
+                                "error": f"Cannot return more {part_name}s than used in this ticket"
+                            }
+                        ),
+                        400,
+                    )
+                return_stock(inventory_id, quantity_returned)
+
+            part_messages = []
+            if quantity_used > 0:
+                part_messages.append(f"{quantity_used} {part_name}(s) added")
+            if quantity_returned > 0:
+                part_messages.append(f"{quantity_returned} {part_name}(s) removed")
+            messages.append(" and ".join(part_messages))
+
+        db.session.commit()
 
         return (
-            jsonify(
-                {"message": " and ".join(messages), "ticket_id": service_ticket.id}
-            ),
+            jsonify({"message": ", ".join(messages), "ticket_id": ticket_id}),
             200,
         )
 
@@ -187,52 +606,49 @@ def update_service_ticket_part(user, user_role, ticket_id):
 @roles_required(["mechanic"])
 def update_service_ticket_mechanics(user, user_role, ticket_id):
     try:
-        data = edit_service_ticket_mechanics_schema.load(request.json)
+        data = edit_service_ticket_mechanics_validator.load(request.json)
 
         ticket = db.session.get(ServiceTicket, ticket_id)
         if not ticket:
             return jsonify({"error": "Service ticket not found"}), 404
 
-        for mechanic_id in data.get("add_mechanic_ids", []):
-            mechanic = db.session.get(Mechanic, mechanic_id)
+        # The schema already checked every id exists with one IN query,
+        # from here on it's set arithmetic on mechanic ids
+        current_ids = set(
+            db.session.scalars(
+                select(service_mechanics.c.mechanic_id).where(
+                    service_mechanics.c.service_ticket_id == ticket_id
+                )
+            )
+        )
+        add_ids = set(data.get("add_mechanic_ids", [])) - current_ids
+        remove_ids = set(data.get("remove_mechanic_ids", [])) & current_ids
 
-            if mechanic and mechanic not in ticket.mechanics:
-                ticket.mechanics.append(mechanic)
+        if remove_ids and not (current_ids | add_ids) - remove_ids:
+            return (
+                jsonify(
+                    {
+                        "error": "Cannot remove the last mechanic from service ticket; at least one must remain."
+                    }
+                ),
+                400,
+            )
 
-        for mechanic_id in data.get("remove_mechanic_ids", []):
-            mechanic = db.session.get(Mechanic, mechanic_id)
-            if mechanic and mechanic in ticket.mechanics:
-                if len(ticket.mechanics) <= 1:
-                    return (
-                        jsonify(
-                            {
-                                "error": "Cannot remove the last mechanic from service ticket; at least one must remain."
-                            }
-                        ),
-                        400,
-                    )
-                ticket.mechanics.remove(mechanic)
-
-        # Handle mechanics
-        # mechanic_ids = data.pop("mechanic_ids", None)
-        # if mechanic_ids is not None:
-        #     mechanics = (
-        #         db.session.query(Mechanic)
-        #         .filter(Mechanic.id.in_(mechanic_ids))
-        #         .all()
-        #         # SELECT * FROM mechanics WHERE id IN (mechanic_ids)
-        #     )
-        #     if len(mechanics) != len(mechanic_ids):
-        #         return jsonify({"error": "One or more mechanic IDs are invalid"}), 400
-
-        #     # Optional: prevent removing the last mechanic
-        #     if len(mechanics) == 0 and len(ticket.mechanics) <= 1:
-        #         return (
-        #             jsonify({"error": "Cannot remove the last mechanic from a ticket"}),
-        #             400,
-        #         )
-
-        #     ticket.mechanics = mechanics
+        if add_ids:
+            db.session.execute(
+                insert(service_mechanics),
+                [
+                    {"service_ticket_id": ticket_id, "mechanic_id": mechanic_id}
+                    for mechanic_id in sorted(add_ids)
+                ],
+            )
+        if remove_ids:
+            db.session.execute(
+                delete(service_mechanics).where(
+                    service_mechanics.c.service_ticket_id == ticket_id,
+                    service_mechanics.c.mechanic_id.in_(remove_ids),
+                )
+            )
 
         db.session.commit()
         return service_ticket_schema.jsonify(ticket), 200
@@ -249,7 +665,7 @@ def update_service_ticket_mechanics(user, user_role, ticket_id):
 @roles_required(["mechanic"])
 def update_service_ticket_info(user, user_role, ticket_id):
     try:
-        data = edit_service_ticket_info_schema.load(request.json, partial=True)
+        data = edit_service_ticket_info_validator.load(request.json, partial=True)
 
         ticket = db.session.get(ServiceTicket, ticket_id)
         if not ticket:
@@ -1,22 +1,40 @@
-from marshmallow import ValidationError, pre_load, validates
+from marshmallow import ValidationError, fields, pre_load, validates
 from app.extensions import ma
-from app.models import ServiceTicket, Customer, Mechanic, db
-from datetime import date, datetime
+from app.utils.serializers import CompiledSerializer
+from app.utils.validators import CompiledValidator
+from app.models import ServiceTicket, Customer, Mechanic
+from datetime import date
 from app.functions import strip_input
+from app.utils.loaders import get_loader
 import re
 from app.blueprints.inventories.schemas import inventories_service_ticket_schema
 
 VIN_REGEX = re.compile(r"^[A-HJ-NPR-Z0-9]{17}$")  # Excludes I, O, Q
+VIN_PREFIX_REGEX = re.compile(r"^[A-HJ-NPR-Z0-9]{3,16}$")
 DATE_REGEX = re.compile(r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$")
 
 
+class ServiceDate(fields.Date):
+    """YYYY-MM-DD string in the API, a date object in the model"""
+
+    default_error_messages = {"invalid": "Service date must be in format YYYY-MM-DD"}
+
+    def _deserialize(self, value, attr, data, **kwargs):
+        if not isinstance(value, str) or not value.strip():
+            raise ValidationError("Service date cannot be blank, must be YYYY-MM-DD")
+        if not DATE_REGEX.match(value):
+            raise self.make_error("invalid")
+        return super()._deserialize(value, attr, data, **kwargs)
+
+
 class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = ServiceTicket
 
     ticket_id = ma.Int(load_only=True)
+    service_date = ServiceDate(required=True)
     customer_id = ma.Int(required=True)
-    mechanic_ids = ma.List(ma.Int(), required=True)
+    mechanic_ids = ma.List(ma.Int(), required=True, load_only=True)
 
     inventory_links = ma.Nested(
         inventories_service_ticket_schema,
@@ -41,14 +59,18 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
 
     @pre_load
     def preprocess(self, data, **kwargs):
-        return strip_input(data)
+        data = strip_input(data)
+        # VINs are stored upper-cased so lookups can use the index
+        if isinstance(data.get("VIN"), str):
+            data["VIN"] = data["VIN"].upper()
+        return data
 
     @validates("mechanic_ids")
     def validate_mechanic_ids(self, value, **kwargs):
         if not value or len(value) == 0:
             raise ValidationError("At least one mechanic must be assigned")
 
-        mechanics = db.session.query(Mechanic).filter(Mechanic.id.in_(value)).all()
+        mechanics = get_loader(Mechanic).load_many(value)
         if len(mechanics) != len(value):
             raise ValidationError("One or more mechanic IDs are invalid")
         return value
@@ -57,7 +79,7 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     def validate_customer_id(self, value, **kwargs):
         if not value:
             raise ValidationError("Customer ID cannot be blank")
-        existing = db.session.query(Customer).filter(Customer.id == value).first()
+        existing = get_loader(Customer).load(value)
         if not existing:
             raise ValidationError(f"Customer with ID {value} does not exist")
         return value
@@ -66,7 +88,7 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     def validate_vin(self, value, **kwargs):
         if not value:
             raise ValidationError("VIN cannot be blank")
-        if not VIN_REGEX.match(value.upper()):
+        if not VIN_REGEX.match(value):
             raise ValidationError(
                 "Invalid VIN. Must be 17 characters (letters/digits, no I, O, Q)"
             )
@@ -78,17 +100,11 @@ class ServiceTicketSchema(ma.SQLAlchemyAutoSchema):
     # if existing:
     #     raise ValidationError(f"VIN '{value}' is already registered")
     # return value
+    # Format is checked by ServiceDate, value is already a date here
     @validates("service_date")
     def validate_service_date(self, value, **kwargs):
-        if not value or not value.strip():
-            raise ValidationError("Service date cannot be blank, must be YYYY-MM-DD")
-
-        if not DATE_REGEX.match(value):
-            raise ValidationError("Service date must be in format YYYY-MM-DD")
-
         # Optional: check that the date is not in the past
-        service_date_obj = datetime.strptime(value, "%Y-%m-%d").date()
-        if service_date_obj < date.today():
+        if value < date.today():
             raise ValidationError("Service date cannot be in the past")
 
         return value
@@ -124,9 +140,17 @@ class EditServiceTicketMechanicsSchema(ServiceTicketSchema):
             "remove_mechanic_ids",
         )
 
+    @pre_load
+    def queue_mechanic_ids(self, data, **kwargs):
+        # Fetch added and removed mechanics together in one query
+        for key in ("add_mechanic_ids", "remove_mechanic_ids"):
+            if isinstance(data.get(key), list):
+                get_loader(Mechanic).prime(data[key])
+        return data
+
     def _validate_mechanic_ids(self, value):
 
-        mechanics = db.session.query(Mechanic).filter(Mechanic.id.in_(value)).all()
+        mechanics = get_loader(Mechanic).load_many(value)
         if len(mechanics) != len(value):
             raise ValidationError("One or more mechanic IDs are invalid")
         return value
@@ -142,6 +166,20 @@ class EditServiceTicketMechanicsSchema(ServiceTicketSchema):
 
 service_ticket_schema = ServiceTicketSchema()
 service_tickets_schema = ServiceTicketSchema(many=True)
+service_ticket_serializer = CompiledSerializer(service_ticket_schema)
+service_tickets_serializer = CompiledSerializer(service_tickets_schema)
 
 edit_service_ticket_info_schema = EditServiceTicketInfoSchema()
 edit_service_ticket_mechanics_schema = EditServiceTicketMechanicsSchema()
+
+# Write payloads, customer and mechanic ids are checked with one query per
+# model after the rest of the payload
+service_ticket_validator = CompiledValidator(
+    service_ticket_schema,
+    batched={"customer_id": Customer, "mechanic_ids": Mechanic},
+)
+edit_service_ticket_info_validator = CompiledValidator(edit_service_ticket_info_schema)
+edit_service_ticket_mechanics_validator = CompiledValidator(
+    edit_service_ticket_mechanics_schema,
+    batched={"add_mechanic_ids": Mechanic, "remove_mechanic_ids": Mechanic},
+)
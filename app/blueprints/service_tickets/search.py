@@ -0,0 +1,123 @@
+# app/blueprints/service_tickets/search.py
+# Full-text search over service_desc. SQLite keeps an FTS5 index in sync
+# through triggers, MySQL uses a FULLTEXT index maintained by InnoDB.
+import re
+from sqlalchemy import DDL, Float, Integer, event, inspect, select, text
+from sqlalchemy.dialects.mysql import match
+from app.models import ServiceTicket
+
+SEARCH_TERM_REGEX = re.compile(r"\w+")
+MAX_SEARCH_TERMS = 10
+
+FULLTEXT_INDEX = "ft_service_tickets_service_desc"
+
+# External content table, the text itself is only stored in service_tickets
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS service_tickets_fts USING fts5("
+    "service_desc, content='service_tickets', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS service_tickets_fts_insert "
+    "AFTER INSERT ON service_tickets BEGIN "
+    "INSERT INTO service_tickets_fts (rowid, service_desc) "
+    "VALUES (new.id, new.service_desc); END",
+    "CREATE TRIGGER IF NOT EXISTS service_tickets_fts_delete "
+    "AFTER DELETE ON service_tickets BEGIN "
+    "INSERT INTO service_tickets_fts (service_tickets_fts, rowid, service_desc) "
+    "VALUES ('delete', old.id, old.service_desc); END",
+    "CREATE TRIGGER IF NOT EXISTS service_tickets_fts_update "
+    "AFTER UPDATE OF service_desc ON service_tickets BEGIN "
+    "INSERT INTO service_tickets_fts (service_tickets_fts, rowid, service_desc) "
+    "VALUES ('delete', old.id, old.service_desc); "
+    "INSERT INTO service_tickets_fts (rowid, service_desc) "
+    "VALUES (new.id, new.service_desc); END",
+]
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        ServiceTicket.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    ServiceTicket.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS service_tickets_fts").execute_if(dialect="sqlite"),
+)
+event.listen(
+    ServiceTicket.__table__,
+    "after_create",
+    DDL(
+        f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} ON service_tickets (service_desc)"
+    ).execute_if(dialect="mysql"),
+)
+
+
+def create_search_index(conn):
+    """Add the full-text index to an existing service_tickets table"""
+    if conn.dialect.name == "sqlite":
+        if inspect(conn).has_table("service_tickets_fts"):
+            return
+        for statement in SQLITE_SEARCH_DDL:
+            conn.execute(text(statement))
+        # Index the rows that were there before the triggers
+        conn.execute(
+            text(
+                "INSERT INTO service_tickets_fts (service_tickets_fts) "
+                "VALUES ('rebuild')"
+            )
+        )
+    elif conn.dialect.name == "mysql":
+        existing = {i["name"] for i in inspect(conn).get_indexes("service_tickets")}
+        if FULLTEXT_INDEX not in existing:
+            conn.execute(
+                text(
+                    f"CREATE FULLTEXT INDEX {FULLTEXT_INDEX} "
+                    "ON service_tickets (service_desc)"
+                )
+            )
+
+
+def search_terms(q):
+    """Lower-cased words of a search string, punctuation dropped"""
+    return SEARCH_TERM_REGEX.findall(q.lower())[:MAX_SEARCH_TERMS]
+
+
+def search_query(terms, dialect):
+    """
+    Tickets whose service_desc holds every term (as a word prefix),
+    best match first, ties broken by id.
+    """
+    if dialect == "sqlite":
+        matches = (
+            text(
+                "SELECT rowid AS id, bm25(service_tickets_fts) AS rank "
+                "FROM service_tickets_fts WHERE service_tickets_fts MATCH :terms"
+            )
+            .columns(id=Integer, rank=Float)
+            .bindparams(terms=" ".join(f'"{term}"*' for term in terms))
+            .subquery()
+        )
+        # bm25() is lower for better matches
+        return (
+            select(ServiceTicket)
+            .join(matches, matches.c.id == ServiceTicket.id)
+            .order_by(matches.c.rank, ServiceTicket.id)
+        )
+
+    if dialect == "mysql":
+        score = match(
+            ServiceTicket.service_desc,
+            against=" ".join(f"+{term}*" for term in terms),
+        ).in_boolean_mode()
+        return (
+            select(ServiceTicket)
+            .where(score > 0)
+            .order_by(score.desc(), ServiceTicket.id)
+        )
+
+    # No full-text index on other databases, match substrings unranked
+    return (
+        select(ServiceTicket)
+        .where(*(ServiceTicket.service_desc.ilike(f"%{term}%") for term in terms))
+        .order_by(ServiceTicket.id)
+    )
@@ -0,0 +1,70 @@
+# app/blueprints/service_tickets/stock.py
+# Single-statement stock and part-link updates, safe under concurrent requests
+# without locking rows up front.
+from sqlalchemy import update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from app.models import Inventory, InventoryServiceTicket, db
+
+
+def take_stock(inventory_id, quantity):
+    """Remove quantity from a part's stock, False if not enough is left"""
+    result = db.session.execute(
+        update(Inventory)
+        .where(Inventory.id == inventory_id, Inventory.quantity >= quantity)
+        .values(quantity=Inventory.quantity - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def return_stock(inventory_id, quantity):
+    db.session.execute(
+        update(Inventory)
+        .where(Inventory.id == inventory_id)
+        .values(quantity=Inventory.quantity + quantity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def add_used_parts(ticket_id, inventory_id, quantity):
+    """Create the ticket's link to a part, or add to quantity_used if it exists"""
+    values = {
+        "service_ticket_id": ticket_id,
+        "inventory_id": inventory_id,
+        "quantity_used": quantity,
+    }
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "mysql":
+        stmt = mysql.insert(InventoryServiceTicket).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            quantity_used=InventoryServiceTicket.quantity_used
+            + stmt.inserted.quantity_used
+        )
+    else:
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(InventoryServiceTicket).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["service_ticket_id", "inventory_id"],
+            set_={
+                "quantity_used": InventoryServiceTicket.quantity_used
+                + stmt.excluded.quantity_used
+            },
+        )
+
+    db.session.execute(stmt)
+
+
+def remove_used_parts(ticket_id, inventory_id, quantity):
+    """Take quantity off the ticket's link to a part, False if fewer were used"""
+    result = db.session.execute(
+        update(InventoryServiceTicket)
+        .where(
+            InventoryServiceTicket.service_ticket_id == ticket_id,
+            InventoryServiceTicket.inventory_id == inventory_id,
+            InventoryServiceTicket.quantity_used >= quantity,
+        )
+        .values(quantity_used=InventoryServiceTicket.quantity_used - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
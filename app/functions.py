@@ -1,5 +1,6 @@
 import re
 from marshmallow import ValidationError
+from sqlalchemy import exists, select
 from app.models import db
 
 PHONE_REGEX = re.compile(r"^\d{3}-\d{3}-\d{4}$")
@@ -29,27 +30,83 @@ def validate_password(value, **kwargs):
     return value
 
 
-def validate_email(model, value, **kwargs):
+def validate_email(value, **kwargs):
     if not EMAIL_REGEX.match(value):
         raise ValidationError(
             "Invalid email address, must be in format: user@example.com"
         )
-
-    # DB uniqueness check
-    existing = db.session.query(model).filter(model.email == value).first()
-    if existing:
-        raise ValidationError("Email already associated with an account")
-
+    # Uniqueness is enforced by the unique constraint on insert/update,
+    # see integrity_error_messages
     return value
 
 
-def validate_phone(model, value, **kwargs):
+def validate_phone(value, **kwargs):
     if not PHONE_REGEX.match(value):
         raise ValidationError("Invalid phone number format (XXX-XXX-XXXX)")
+    return value
 
-    # DB uniqueness check
-    existing = db.session.query(model).filter(model.phone == value).first()
-    if existing:
-        raise ValidationError("Phone number already associated with an account")
 
-    return value
+UNIQUE_FIELD_MESSAGES = {
+    "email": "Email already associated with an account",
+    "phone": "Phone number already associated with an account",
+}
+
+
+def _violated_columns(error):
+    detail = str(getattr(error, "orig", error))
+
+    # MySQL: Duplicate entry 'x' for key 'customers.email'
+    match = re.search(r"for key '([^']+)'", detail)
+    if match:
+        return {match.group(1).split(".")[-1]}
+
+    # SQLite: UNIQUE constraint failed: customers.email
+    match = re.search(r"UNIQUE constraint failed: (.+)", detail)
+    if match:
+        return {column.strip().split(".")[-1] for column in match.group(1).split(",")}
+
+    # PostgreSQL: Key (email)=(x) already exists.
+    match = re.search(r"Key \(([^)]+)\)=", detail)
+    if match:
+        return {column.strip() for column in match.group(1).split(",")}
+
+    return set()
+
+
+def _other_taken_fields(model, data, violated, user_id=None):
+    """Other unique fields in data already used by another account"""
+    fields = [
+        field
+        for field in UNIQUE_FIELD_MESSAGES
+        if field not in violated and data.get(field) is not None
+    ]
+    if not fields:
+        return set()
+
+    # The database only reports the first constraint it hits, check the
+    # rest with one SELECT of an EXISTS per field
+    checks = []
+    for field in fields:
+        condition = getattr(model, field) == data[field]
+        if user_id is not None:
+            condition &= model.id != user_id
+        checks.append(exists().where(condition).label(field))
+    row = db.session.execute(select(*checks)).one()
+    return {field for field in fields if row._mapping[field]}
+
+
+def integrity_error_messages(error, model=None, data=None, user_id=None):
+    """Translate a unique constraint violation into field-level validation messages
+
+    Pass the model and loaded data to report every unique field that's
+    taken, user_id excludes the account being updated.
+    """
+    violated = _violated_columns(error)
+    if violated and model is not None and data:
+        violated |= _other_taken_fields(model, data, violated, user_id)
+    messages = {
+        field: [message]
+        for field, message in UNIQUE_FIELD_MESSAGES.items()
+        if field in violated
+    }
+    return messages or {"error": str(getattr(error, "orig", error))}
@@ -0,0 +1,209 @@
+# app/migrations.py
+# db.create_all() only creates missing tables, so databases created before a
+# model change are brought up to date here. Every migration checks the live
+# schema first, which makes it a no-op on a database create_all() just built.
+#
+# flask upgrade-db  (also run on startup from flask_app.py)
+#
+# Every gunicorn worker imports flask_app and upgrades on startup, so
+# upgrade_db() holds a database-wide lock while it runs. The other workers
+# wait for it and then find nothing left to apply. MySQL DDL can't be
+# rolled back, two workers running the same migration would break it.
+import zlib
+from contextlib import contextmanager
+from sqlalchemy import (
+    Column,
+    Date,
+    MetaData,
+    String,
+    Table,
+    func,
+    inspect,
+    text,
+    update,
+)
+from app.models import Base, db, service_mechanics
+from app.utils.db_pool import STATEMENT_TIMEOUT_SQL
+from app.blueprints.service_tickets.search import create_search_index
+
+migration_metadata = MetaData()
+
+MIGRATION_LOCK_NAME = "schema_migrations"
+# Seconds a worker waits for another one's migrations before giving up
+MIGRATION_LOCK_TIMEOUT = 600
+
+schema_migrations = Table(
+    "schema_migrations",
+    migration_metadata,
+    Column("version", String(64), primary_key=True),
+)
+
+
+def _create_missing_indexes(conn, table_name, index_names):
+    table = Base.metadata.tables[table_name]
+    existing = {index["name"] for index in inspect(conn).get_indexes(table_name)}
+    for index in table.indexes:
+        if index.name in index_names and index.name not in existing:
+            index.create(conn)
+
+
+def _add_service_mechanics_primary_key(conn):
+    if inspect(conn).get_pk_constraint("service_mechanics")["constrained_columns"]:
+        return
+
+    # Keep one row per (ticket, mechanic) pair, a primary key can't hold nulls
+    distinct_rows = (
+        "SELECT DISTINCT service_ticket_id, mechanic_id FROM {table} "
+        "WHERE service_ticket_id IS NOT NULL AND mechanic_id IS NOT NULL"
+    )
+
+    if conn.dialect.name == "sqlite":
+        # SQLite can't add a primary key to an existing table, rebuild it
+        conn.execute(
+            text("ALTER TABLE service_mechanics RENAME TO service_mechanics_old")
+        )
+        service_mechanics.create(conn)
+        conn.execute(
+            text(
+                "INSERT INTO service_mechanics (service_ticket_id, mechanic_id) "
+                + distinct_rows.format(table="service_mechanics_old")
+            )
+        )
+        conn.execute(text("DROP TABLE service_mechanics_old"))
+        return
+
+    conn.execute(
+        text(
+            "CREATE TABLE service_mechanics_distinct AS "
+            + distinct_rows.format(table="service_mechanics")
+        )
+    )
+    conn.execute(text("DELETE FROM service_mechanics"))
+    conn.execute(
+        text(
+            "INSERT INTO service_mechanics (service_ticket_id, mechanic_id) "
+            "SELECT service_ticket_id, mechanic_id FROM service_mechanics_distinct"
+        )
+    )
+    conn.execute(text("DROP TABLE service_mechanics_distinct"))
+    conn.execute(
+        text(
+            "ALTER TABLE service_mechanics "
+            "ADD PRIMARY KEY (service_ticket_id, mechanic_id)"
+        )
+    )
+
+
+def add_lookup_indexes(conn):
+    """Composite key for service_mechanics and indexes for the FK/lookup columns"""
+    _add_service_mechanics_primary_key(conn)
+    _create_missing_indexes(
+        conn,
+        "service_tickets",
+        {"ix_service_tickets_customer_id", "ix_service_tickets_VIN"},
+    )
+    _create_missing_indexes(
+        conn, "service_mechanics", {"ix_service_mechanics_mechanic_id"}
+    )
+    _create_missing_indexes(
+        conn,
+        "inventory_service_tickets",
+        {"ix_inventory_service_tickets_inventory_id"},
+    )
+
+
+def service_date_as_date(conn):
+    """service_tickets.service_date from VARCHAR(10) to DATE, plus an index"""
+    columns = inspect(conn).get_columns("service_tickets")
+    column_type = next(c["type"] for c in columns if c["name"] == "service_date")
+
+    # SQLite stores dates as YYYY-MM-DD text either way, only the index is new
+    if conn.dialect.name != "sqlite" and not isinstance(column_type, Date):
+        if conn.dialect.name == "postgresql":
+            conn.execute(
+                text(
+                    "ALTER TABLE service_tickets ALTER COLUMN service_date "
+                    "TYPE DATE USING service_date::date"
+                )
+            )
+        else:
+            conn.execute(
+                text("ALTER TABLE service_tickets MODIFY service_date DATE NOT NULL")
+            )
+
+    _create_missing_indexes(
+        conn, "service_tickets", {"ix_service_tickets_service_date"}
+    )
+
+
+def uppercase_vins(conn):
+    """VINs are looked up upper-cased, bring older lower/mixed case rows in line"""
+    tickets = Base.metadata.tables["service_tickets"]
+    # No WHERE clause, MySQL's case-insensitive collations treat "abc" = "ABC"
+    conn.execute(update(tickets).values(VIN=func.upper(tickets.c.VIN)))
+
+
+# (version, migration) in the order they must run
+MIGRATIONS = [
+    ("0001_add_lookup_indexes", add_lookup_indexes),
+    ("0002_service_date_as_date", service_date_as_date),
+    ("0003_uppercase_vins", uppercase_vins),
+    ("0004_service_desc_search_index", create_search_index),
+]
+
+
+@contextmanager
+def migration_lock():
+    """Hold a lock on the whole database, for one process at a time to migrate"""
+    with db.engine.connect() as conn:
+        dialect = conn.dialect.name
+        if dialect in STATEMENT_TIMEOUT_SQL:
+            # Waiting for the lock must not hit the statement timeout
+            conn.execute(text(STATEMENT_TIMEOUT_SQL[dialect].format(0)))
+        # Both are session locks, released with the connection if we die
+        if dialect == "mysql":
+            acquired = conn.scalar(
+                text("SELECT GET_LOCK(:name, :timeout)"),
+                {"name": MIGRATION_LOCK_NAME, "timeout": MIGRATION_LOCK_TIMEOUT},
+            )
+            if acquired != 1:
+                raise RuntimeError("Timed out waiting for another migration")
+        elif dialect == "postgresql":
+            key = zlib.crc32(MIGRATION_LOCK_NAME.encode())
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": key})
+        # SQLite has a single writer, there's nothing to take
+        conn.commit()
+
+        try:
+            yield
+        finally:
+            if dialect == "mysql":
+                conn.execute(
+                    text("SELECT RELEASE_LOCK(:name)"), {"name": MIGRATION_LOCK_NAME}
+                )
+            elif dialect == "postgresql":
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+            conn.commit()
+            if dialect in STATEMENT_TIMEOUT_SQL:
+                # Don't hand the connection back to the pool without its timeout
+                conn.invalidate()
+
+
+def upgrade_db():
+    """Create missing tables and apply pending migrations, returns the
+    versions that ran"""
+    with migration_lock():
+        db.create_all()
+        schema_migrations.create(db.engine, checkfirst=True)
+        with db.engine.connect() as conn:
+            applied = set(conn.scalars(schema_migrations.select()))
+
+        ran = []
+        for version, migration in MIGRATIONS:
+            if version in applied:
+                continue
+            with db.engine.begin() as conn:
+                migration(conn)
+                conn.execute(schema_migrations.insert().values(version=version))
+            ran.append(version)
+    return ran
@@ -16,8 +16,17 @@ db = SQLAlchemy(model_class=Base)
 service_mechanics = Table(
     "service_mechanics",
     Base.metadata,
-    Column("service_ticket_id", ForeignKey("service_tickets.id", ondelete="CASCADE")),
-    Column("mechanic_id", ForeignKey("mechanics.id", ondelete="CASCADE")),
+    Column(
+        "service_ticket_id",
+        ForeignKey("service_tickets.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "mechanic_id",
+        ForeignKey("mechanics.id", ondelete="CASCADE"),
+        primary_key=True,
+        index=True,
+    ),
 )
 
 
@@ -85,7 +94,7 @@ class InventoryServiceTicket(Base):
     )
 
     inventory_id: Mapped[int] = mapped_column(
-        ForeignKey("inventories.id", ondelete="CASCADE"), primary_key=True
+        ForeignKey("inventories.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
     quantity_used: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
@@ -101,11 +110,11 @@ class ServiceTicket(Base):
     __tablename__ = "service_tickets"
 
     id: Mapped[int] = mapped_column(primary_key=True)
-    VIN: Mapped[str] = mapped_column(String(255), nullable=False)
-    service_date: Mapped[str] = mapped_column(String(10), nullable=False)
+    VIN: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    service_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     service_desc: Mapped[str] = mapped_column(String(255), nullable=False)
     customer_id: Mapped[int] = mapped_column(
-        ForeignKey("customers.id", ondelete="CASCADE")
+        ForeignKey("customers.id", ondelete="CASCADE"), index=True
     )
 
     customer: Mapped["Customer"] = relationship(back_populates="service_tickets")
@@ -0,0 +1,114 @@
+from app import create_app
+from app.models import Inventory, db
+from app.utils import compression
+import gzip
+import json
+import unittest
+from unittest import mock
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# python -m unittest discover -s app/tests
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add_all(
+                Inventory(part_name=f"Brake pad {i}", price=19.99, quantity=20)
+                for i in range(50)
+            )
+            db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_gzip_list_response(self):
+        plain = self.client.get("/inventories/")
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertIn("Accept-Encoding", plain.headers["Vary"])
+
+        response = self.client.get(
+            "/inventories/", headers={"Accept-Encoding": "gzip, deflate"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertLess(len(response.data), len(plain.data))
+        self.assertEqual(json.loads(gzip.decompress(response.data)), plain.get_json())
+
+        # Each coding has its own ETag, and either one revalidates
+        etag = response.headers["ETag"]
+        self.assertEqual(etag, plain.headers["ETag"][:-1] + '-gzip"')
+        response = self.client.get(
+            "/inventories/",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": etag},
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+
+    @unittest.skipUnless(brotli, "brotli is not installed")
+    def test_brotli_list_response(self):
+        plain = self.client.get("/inventories/")
+
+        # Preferred over gzip when both are accepted
+        response = self.client.get(
+            "/inventories/", headers={"Accept-Encoding": "gzip, br"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(json.loads(brotli.decompress(response.data)), plain.get_json())
+
+        etag = response.headers["ETag"]
+        self.assertEqual(etag, plain.headers["ETag"][:-1] + '-br"')
+        response = self.client.get(
+            "/inventories/", headers={"Accept-Encoding": "br", "If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_response_compressed_once(self):
+        headers = {"Accept-Encoding": "gzip"}
+        with mock.patch(
+            "app.utils.response_cache.compress", wraps=compression.compress
+        ) as compress:
+            first = self.client.get("/inventories/", headers=headers)
+            second = self.client.get("/inventories/", headers=headers)
+
+        self.assertEqual(compress.call_count, 1)
+        self.assertEqual(first.data, second.data)
+
+    def test_small_and_unaccepted_responses_not_compressed(self):
+        response = self.client.get(
+            "/inventories/", headers={"Accept-Encoding": "gzip;q=0, identity"}
+        )
+        self.assertNotIn("Content-Encoding", response.headers)
+
+        response = self.client.get(
+            "/inventories/1", headers={"Accept-Encoding": "gzip"}
+        )
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_uncached_response_compressed(self):
+        self.app.config["COMPRESS_MIN_SIZE"] = 0
+        response = self.client.post(
+            "/customers/login",
+            json={"email": "nobody@gmail.com", "password": "password"},
+            headers={"Accept-Encoding": "gzip"},
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(
+            json.loads(gzip.decompress(response.data)),
+            {"messages": "Invalid email or password"},
+        )
@@ -2,6 +2,7 @@ from app import create_app
 from app.models import Customer, db
 import unittest
 from app.tests.helper_function import login_customer
+from app.utils.utils import token_version_cache, verified_token_cache
 
 # python -m unittest discover -s app/tests
 
@@ -57,6 +58,63 @@ class TestCustomer(unittest.TestCase):
             response.get_json()["email"], ["Missing data for required field."]
         )
 
+    def test_create_customer_duplicate_email(self):
+        customer_payload = {
+            "email": "phil@gmail.com",
+            "name": "Phillip",
+            "phone": "333-333-4444",
+            "password": "password",
+        }
+
+        response = self.client.post("/customers/", json=customer_payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(), {"email": ["Email already associated with an account"]}
+        )
+
+    def test_duplicate_email_and_phone(self):
+        customer_payload = {
+            "email": "phil@gmail.com",
+            "name": "Phillip",
+            "phone": "333-333-2222",
+            "password": "password",
+        }
+
+        response = self.client.post("/customers/", json=customer_payload)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(),
+            {
+                "email": ["Email already associated with an account"],
+                "phone": ["Phone number already associated with an account"],
+            },
+        )
+
+        # Updating to your own email isn't a collision
+        headers = {
+            "Authorization": "Bearer "
+            + login_customer(self.client, email="phil@gmail.com", password="password")
+        }
+        self.client.post(
+            "/customers/",
+            json={
+                "email": "taylor@gmail.com",
+                "name": "Taylor",
+                "phone": "333-333-4444",
+                "password": "password",
+            },
+        )
+        response = self.client.put(
+            "/customers/",
+            json={"email": "phil@gmail.com", "phone": "333-333-4444"},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(),
+            {"phone": ["Phone number already associated with an account"]},
+        )
+
     def test_login_customer(self):
         credentials = {"email": "phil@gmail.com", "password": "password"}
 
@@ -84,6 +142,57 @@ class TestCustomer(unittest.TestCase):
         self.assertIn("customers", data)
         self.assertEqual(data["customers"][0]["name"], "Phil")
 
+    def test_get_customers_after(self):
+        customer_payload = {
+            "email": "taylor@gmail.com",
+            "name": "Taylor",
+            "phone": "333-333-4444",
+            "password": "password",
+        }
+        self.client.post("/customers/", json=customer_payload)
+
+        response = self.client.get("/customers/?after=0&limit=1")
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["pages"], 2)
+        self.assertEqual(data["customers"][0]["name"], "Phil")
+        self.assertEqual(data["next_after"], 1)
+
+        response = self.client.get(f"/customers/?after={data['next_after']}&limit=1")
+        data = response.get_json()
+        self.assertEqual(data["customers"][0]["name"], "Taylor")
+        self.assertIsNone(data["next_after"])
+
+        response = self.client.get("/customers/?after=2&limit=1")
+        data = response.get_json()
+        self.assertEqual(data["customers"], [])
+        self.assertIsNone(data["next_after"])
+
+    def test_get_customers_total_refreshes_on_delete(self):
+        response = self.client.get("/customers/")
+        self.assertEqual(response.get_json()["total"], 1)
+
+        self.client.post(
+            "/customers/",
+            json={
+                "email": "taylor@gmail.com",
+                "name": "Taylor",
+                "phone": "333-333-4444",
+                "password": "password",
+            },
+        )
+        response = self.client.get("/customers/")
+        self.assertEqual(response.get_json()["total"], 2)
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_customer(self.client, email="phil@gmail.com", password="password")
+        }
+        self.client.delete("/customers/", headers=headers)
+        response = self.client.get("/customers/")
+        self.assertEqual(response.get_json()["total"], 1)
+
     def test_get_customer(self):
         response = self.client.get("/customers/1")
         self.assertEqual(response.status_code, 200)
@@ -108,3 +217,65 @@ class TestCustomer(unittest.TestCase):
         self.assertEqual(
             response.get_json()["message"], "Customer id: 1, successfully deleted"
         )
+
+    def test_token_version_cache(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_customer(self.client, email="phil@gmail.com", password="password")
+        }
+        self.client.get("/customers/my-tickets", headers=headers)
+        hits = token_version_cache.hits
+
+        response = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(token_version_cache.hits, hits + 1)
+
+        # Deleting the customer must evict the cached token version
+        self.client.delete("/customers/", headers=headers)
+        response = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()["message"], "Token is no longer valid")
+
+    def test_token_version_evicted_on_commit(self):
+        token = login_customer(self.client, email="phil@gmail.com", password="password")
+        headers = {"Authorization": "Bearer " + token}
+
+        with self.app.app_context():
+            customer = db.session.get(Customer, 1)
+            key = ("customer", customer.user_uuid)
+            old = (customer.id, customer.token_version)
+            customer.token_version += 1
+            db.session.flush()
+            # A request between the flush and the commit still reads and
+            # caches the committed version
+            token_version_cache.set(key, old)
+            db.session.commit()
+
+        response = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()["message"], "Token is no longer valid")
+
+        # A rolled back change leaves the cached version alone
+        with self.app.app_context():
+            customer = db.session.get(Customer, 1)
+            customer.token_version += 1
+            db.session.flush()
+            token_version_cache.set(key, (customer.id, customer.token_version - 1))
+            db.session.rollback()
+        self.assertIsNotNone(token_version_cache.get(key))
+
+    def test_verified_token_cache(self):
+        token = login_customer(self.client, email="phil@gmail.com", password="password")
+        headers = {"Authorization": "Bearer " + token}
+
+        self.client.get("/customers/my-tickets", headers=headers)
+        hits = verified_token_cache.hits
+        response = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(verified_token_cache.hits, hits + 1)
+
+        # A tampered signature is never served from the cache
+        headers = {"Authorization": "Bearer " + token[:-2] + "xx"}
+        response = self.client.get("/customers/my-tickets", headers=headers)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.get_json()["message"], "Invalid token!")
@@ -0,0 +1,127 @@
+from app import create_app
+from app.models import Mechanic, db
+from app.tests.helper_function import login_mechanic
+from app.utils import db_pool
+import unittest
+from unittest import mock
+from config import engine_options
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+
+# python -m unittest discover -s app/tests
+
+
+class TestInternalMetrics(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.testing = True
+        self.app.config["INTERNAL_METRICS_TOKEN"] = "metrics-token"
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add(
+                Mechanic(
+                    name="Taylor",
+                    email="taylor@gmail.com",
+                    phone="333-333-2222",
+                    password="password",
+                    salary=80000,
+                )
+            )
+            db.session.commit()
+        self.client = self.app.test_client()
+
+    def get_metrics(self):
+        response = self.client.get(
+            "/internal/metrics", headers={"Authorization": "Bearer metrics-token"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_metrics_require_token(self):
+        response = self.client.get(
+            "/internal/metrics", headers={"Authorization": "Bearer wrong"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+        self.app.config["INTERNAL_METRICS_TOKEN"] = None
+        response = self.client.get(
+            "/internal/metrics", headers={"Authorization": "Bearer metrics-token"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_metrics_count_pool_events(self):
+        self.client.get("/mechanics/")
+
+        data = self.get_metrics()
+        pool = data["db_pools"]["default"]
+        self.assertGreaterEqual(pool["connects"], 1)
+        self.assertGreaterEqual(pool["checkouts"], 1)
+        self.assertEqual(pool["checkouts"], pool["checkins"])
+
+    def test_metrics_count_token_cache_hits(self):
+        token = login_mechanic(self.client, "taylor@gmail.com", "password")
+        headers = {"Authorization": f"Bearer {token}"}
+        self.client.get("/mechanics/my-tickets", headers=headers)
+        before = self.get_metrics()
+
+        self.client.get("/mechanics/my-tickets", headers=headers)
+        after = self.get_metrics()
+        for cache in ("token_version_cache", "verified_token_cache"):
+            self.assertEqual(after[cache]["hits"], before[cache]["hits"] + 1)
+
+
+class TestPoolStats(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://", poolclass=QueuePool, pool_size=2, max_overflow=1
+        )
+        self.stats = db_pool._track(self.engine)
+        db_pool._tracked.add(self.stats)
+
+    def tearDown(self):
+        self.engine.dispose()
+
+    def test_overflow_and_fork_disposal(self):
+        connections = [self.engine.connect() for _ in range(3)]
+        for conn in connections:
+            conn.execute(text("SELECT 1"))
+
+        stats = self.stats.stats()
+        self.assertEqual(stats["checked_out"], 3)
+        self.assertEqual(stats["overflow"], 1)
+        self.assertEqual(stats["peak_overflow"], 1)
+        self.assertEqual(stats["connects"], 3)
+
+        # A forked child starts with an empty pool and fresh counters
+        db_pool.dispose_engines_after_fork()
+        stats = self.stats.stats()
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checkouts"], 0)
+
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        self.assertEqual(self.stats.stats()["connects"], 1)
+
+        for conn in connections:
+            conn.close()
+
+
+class TestEngineOptions(unittest.TestCase):
+    def pre_ping(self, value):
+        with mock.patch.dict("os.environ", {"DB_POOL_PRE_PING": value}):
+            return engine_options(pool_size=5, max_overflow=5)["pool_pre_ping"]
+
+    def test_pre_ping_flag(self):
+        for value in ("1", "true", "Yes", "on"):
+            self.assertTrue(self.pre_ping(value))
+        for value in ("0", "false", "no", "OFF"):
+            self.assertFalse(self.pre_ping(value))
+        with self.assertRaises(ValueError):
+            self.pre_ping("enabled")
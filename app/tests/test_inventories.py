@@ -1,6 +1,9 @@
+import io
 from app import create_app
+from app.blueprints.inventories.importer import import_parts, iter_ndjson_rows
 from app.models import Mechanic, Inventory, db
 import unittest
+from sqlalchemy import event, text
 from app.tests.helper_function import login_mechanic
 
 # python -m unittest discover -s app/tests
@@ -55,6 +58,92 @@ class TestInventories(unittest.TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.get_json()["price"], 200)
 
+    def test_import_inventory_parts_csv(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email="taylor@gmail.com", password="password"
+            ),
+            "Content-Type": "text/csv",
+        }
+        catalog = (
+            "part_name,price,quantity\n"
+            "Headlights,64.99,30\n"
+            "Brake Pads,39.99,12\n"
+            "Oil Filter,-1,5\n"
+        )
+
+        response = self.client.post(
+            "/inventories/import", data=catalog, headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data["inserted"], 1)
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual(data["failed"], 1)
+        self.assertEqual(
+            data["errors"],
+            [{"line": 4, "errors": {"price": ["Price must be at least 0.01"]}}],
+        )
+
+        with self.app.app_context():
+            headlights = db.session.get(Inventory, self.inventory_part_id)
+            self.assertEqual(headlights.quantity, 30)
+            self.assertEqual(headlights.price, 64.99)
+
+    def test_import_inventory_parts_ndjson_in_chunks(self):
+        catalog = b"".join(
+            b'{"part_name": "Part %d", "price": 1.5, "quantity": 2}\n' % i
+            for i in range(7)
+        )
+
+        with self.app.app_context():
+            result = import_parts(iter_ndjson_rows(io.BytesIO(catalog)), chunk_size=3)
+            self.assertEqual(result["inserted"], 7)
+            self.assertEqual(db.session.query(Inventory).count(), 8)
+
+    def _import(self, catalog):
+        with self.app.app_context():
+            return import_parts(iter_ndjson_rows(io.BytesIO(catalog)))
+
+    def test_import_matches_part_names_case_insensitively(self):
+        # Give the table MySQL's case-insensitive collation
+        part_name = Inventory.__table__.c.part_name
+        part_name.type.collation = "NOCASE"
+        self.addCleanup(setattr, part_name.type, "collation", None)
+        with self.app.app_context():
+            Inventory.__table__.drop(db.engine)
+            Inventory.__table__.create(db.engine)
+            db.session.add(Inventory(part_name="Headlights", price=59.99, quantity=20))
+            db.session.commit()
+
+        result = self._import(
+            b'{"part_name": "headlights", "price": 64.99, "quantity": 30}\n'
+            b'{"part_name": "Brake Pads", "price": 39.99, "quantity": 12}\n'
+        )
+        self.assertEqual((result["inserted"], result["updated"]), (1, 1))
+        self.assertEqual(result["errors"], [])
+
+    def test_import_failed_chunk_retried_row_by_row(self):
+        # The lookup misses "headlights", the unique index doesn't
+        with self.app.app_context():
+            with db.engine.begin() as conn:
+                conn.execute(
+                    text(
+                        "CREATE UNIQUE INDEX ix_inventories_part_name_nocase "
+                        "ON inventories (part_name COLLATE NOCASE)"
+                    )
+                )
+
+        result = self._import(
+            b'{"part_name": "headlights", "price": 64.99, "quantity": 30}\n'
+            b'{"part_name": "Brake Pads", "price": 39.99, "quantity": 12}\n'
+        )
+        self.assertEqual((result["inserted"], result["failed"]), (1, 1))
+        self.assertEqual([error["line"] for error in result["errors"]], [1])
+        with self.app.app_context():
+            self.assertEqual(db.session.query(Inventory).count(), 2)
+
     def test_get_inventory_parts(self):
         response = self.client.get("/inventories/")
         self.assertEqual(response.status_code, 200)
@@ -62,6 +151,42 @@ class TestInventories(unittest.TestCase):
         self.assertEqual(data[0]["part_name"], "Headlights")
         self.assertEqual(data[0]["price"], 59.99)
 
+    def test_get_inventory_parts_not_modified(self):
+        response = self.client.get("/inventories/")
+        etag = response.headers["ETag"]
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = self.client.get("/inventories/", headers={"If-None-Match": etag})
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(statements, [])
+
+        # Any write to inventories changes the ETag
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(self.client, email="taylor@gmail.com", password="password")
+        }
+        self.client.put(
+            f"/inventories/{self.inventory_part_id}",
+            json={"quantity": 25},
+            headers=headers,
+        )
+        response = self.client.get("/inventories/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()[0]["quantity"], 25)
+
     def test_get_inventory_part(self):
         part_id = self.inventory_part.id
         response = self.client.get(f"/inventories/{part_id}")
@@ -1,6 +1,7 @@
 from app import create_app
 from app.models import Mechanic, db
 import unittest
+from sqlalchemy import text
 from app.tests.helper_function import login_mechanic
 
 # python -m unittest discover -s app/tests
@@ -81,6 +82,32 @@ class TestMechanic(unittest.TestCase):
             "Invalid phone number format (XXX-XXX-XXXX)", response.get_json()["phone"]
         )
 
+    def test_update_mechanic_duplicate_phone(self):
+        self.client.post(
+            "/mechanics/",
+            json={
+                "email": "jerry@gmail.com",
+                "name": "Jerry",
+                "phone": "333-333-9999",
+                "salary": "23000",
+                "password": "password44",
+            },
+        )
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(self.client, email="taylor@gmail.com", password="password")
+        }
+
+        response = self.client.put(
+            "/mechanics/", json={"phone": "333-333-9999"}, headers=headers
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(),
+            {"phone": ["Phone number already associated with an account"]},
+        )
+
     def test_get_mechanics(self):
         response = self.client.get("/mechanics/")
         self.assertEqual(response.status_code, 200)
@@ -93,6 +120,37 @@ class TestMechanic(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["email"], "taylor@gmail.com")
 
+    def test_get_mechanics_sparse_fields(self):
+        response = self.client.get("/mechanics/?fields=id,name")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [{"id": 1, "name": "Taylor"}])
+
+        response = self.client.get("/mechanics/1?fields=salary")
+        self.assertEqual(response.get_json(), {"salary": 80000})
+
+        response = self.client.get("/mechanics/?fields=")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "fields cannot be empty")
+
+    def test_get_mechanic_cached_until_update(self):
+        self.assertEqual(self.client.get("/mechanics/1").get_json()["name"], "Taylor")
+        self.assertEqual(self.client.get("/mechanics/").get_json()[0]["name"], "Taylor")
+
+        # A write outside the app's session doesn't invalidate anything
+        with self.app.app_context(), db.engine.begin() as conn:
+            conn.execute(text("UPDATE mechanics SET name = 'Casey' WHERE id = 1"))
+        self.assertEqual(self.client.get("/mechanics/1").get_json()["name"], "Taylor")
+        self.assertEqual(self.client.get("/mechanics/").get_json()[0]["name"], "Taylor")
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(self.client, email="taylor@gmail.com", password="password")
+        }
+        self.client.put("/mechanics/", json={"name": "Jerry"}, headers=headers)
+
+        self.assertEqual(self.client.get("/mechanics/1").get_json()["name"], "Jerry")
+        self.assertEqual(self.client.get("/mechanics/").get_json()[0]["name"], "Jerry")
+
     def test_get_mechanic_tickets(self):
         headers = {
             "Authorization": "Bearer "
@@ -0,0 +1,105 @@
+from app import create_app
+from app.extensions import cache
+from app.utils.response_cache import get_or_compute, invalidate, tag_versions
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+# python -m unittest discover -s app/tests
+
+
+class TestSharedResponseCache(unittest.TestCase):
+    def setUp(self):
+        # Two apps on one cache directory stand in for two gunicorn workers
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.workers = []
+        for _ in range(2):
+            app = create_app("TestingConfig")
+            cache.init_app(
+                app,
+                config={
+                    "CACHE_TYPE": "FileSystemCache",
+                    "CACHE_DIR": self.cache_dir.name,
+                },
+            )
+            self.workers.append(app)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_invalidation_reaches_other_workers(self):
+        first, second = self.workers
+
+        with first.app_context():
+            before = tag_versions(["mechanics", "customers"])
+        with second.app_context():
+            self.assertEqual(tag_versions(["mechanics", "customers"]), before)
+            invalidate("mechanics")
+        with first.app_context():
+            after = tag_versions(["mechanics", "customers"])
+
+        self.assertNotEqual(after[0], before[0])
+        self.assertEqual(after[1], before[1])
+
+    def test_evicted_tag_gets_a_new_version(self):
+        with self.workers[0].app_context():
+            (before,) = tag_versions(["inventories"])
+            cache.clear()
+            (after,) = tag_versions(["inventories"])
+
+        self.assertNotEqual(after, before)
+
+
+class TestGetOrCompute(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        time.sleep(0.05)
+        return self.calls
+
+    def test_concurrent_misses_compute_once(self):
+        results = []
+        start = threading.Barrier(8)
+
+        def request():
+            with self.app.app_context():
+                start.wait()
+                results.append(get_or_compute("leaderboard", self.compute, 60))
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(results, [1] * 8)
+
+    def test_uncacheable_values_are_not_stored(self):
+        with self.app.app_context():
+            get_or_compute("count", self.compute, 60, cacheable=lambda v: v > 1)
+            get_or_compute("count", self.compute, 60, cacheable=lambda v: v > 1)
+            self.assertEqual(get_or_compute("count", self.compute, 60), 2)
+        self.assertEqual(self.calls, 2)
+
+    def test_early_refresh_and_jitter(self):
+        self.app.config["CACHE_TTL_JITTER"] = 0.5
+        with self.app.app_context():
+            get_or_compute("count", self.compute, 100)
+            value, computed_in, expires_at = cache.get("count")
+            self.assertGreaterEqual(expires_at - time.time(), 49)
+            self.assertLessEqual(expires_at - time.time(), 100)
+
+            # Pretend the last computation took far longer than the time left
+            cache.set("count", (value, 1000.0, time.time() + 1), 100)
+            with mock.patch("app.utils.response_cache.random.random", return_value=0.5):
+                self.assertEqual(get_or_compute("count", self.compute, 100), 2)
+
+                self.app.config["CACHE_EARLY_REFRESH"] = 0
+                cache.set("count", (value, 1000.0, time.time() + 1), 100)
+                self.assertEqual(get_or_compute("count", self.compute, 100), 1)
@@ -0,0 +1,188 @@
+from app import create_app
+from app.blueprints.service_tickets.search import search_query
+from app.migrations import MIGRATIONS, schema_migrations, upgrade_db
+from app.models import (
+    Base,
+    InventoryServiceTicket,
+    ServiceTicket,
+    db,
+    service_mechanics,
+)
+import os
+import unittest
+from datetime import date
+from sqlalchemy import create_engine, func, inspect, select, text
+from sqlalchemy.dialects import mysql, sqlite
+
+# python -m unittest discover -s app/tests
+
+# Queries behind my-tickets, the leaderboard and the cascade deletes,
+# none of them may fall back to scanning a whole table
+HOT_QUERIES = {
+    "customer tickets": select(ServiceTicket).where(ServiceTicket.customer_id == 1),
+    "mechanic tickets": select(ServiceTicket)
+    .join(service_mechanics)
+    .where(service_mechanics.c.mechanic_id == 1),
+    "ticket mechanics": select(service_mechanics.c.mechanic_id).where(
+        service_mechanics.c.service_ticket_id == 1
+    ),
+    "part links": select(InventoryServiceTicket).where(
+        InventoryServiceTicket.inventory_id == 1
+    ),
+    "tickets by VIN": select(ServiceTicket).where(
+        ServiceTicket.VIN == "1HGCM82633A123456"
+    ),
+    "tickets by VIN prefix": select(ServiceTicket).where(
+        ServiceTicket.VIN.between("1HGCM000000000000", "1HGCMZZZZZZZZZZZZ")
+    ),
+    "tickets in a week": select(ServiceTicket)
+    .where(ServiceTicket.service_date.between(date(2030, 12, 14), date(2030, 12, 20)))
+    .order_by(ServiceTicket.id),
+    "tickets per mechanic": select(
+        service_mechanics.c.mechanic_id, func.count()
+    ).group_by(service_mechanics.c.mechanic_id),
+}
+
+
+ALL_MIGRATIONS = [version for version, _ in MIGRATIONS]
+
+
+def compile_query(query, dialect):
+    return str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+class TestQueryPlans(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_sqlite_hot_queries_use_indexes(self):
+        with self.app.app_context():
+            for name, query in HOT_QUERIES.items():
+                plan = db.session.execute(
+                    text("EXPLAIN QUERY PLAN " + compile_query(query, sqlite.dialect()))
+                ).all()
+                for row in plan:
+                    detail = row[-1]
+                    full_scan = (
+                        detail.startswith("SCAN") and "COVERING INDEX" not in detail
+                    )
+                    self.assertFalse(full_scan, f"{name}: {detail}")
+
+    @unittest.skipUnless(
+        os.environ.get("MYSQL_TEST_DATABASE_URI"),
+        "set MYSQL_TEST_DATABASE_URI to check MySQL query plans",
+    )
+    def test_mysql_hot_queries_use_indexes(self):
+        engine = create_engine(os.environ["MYSQL_TEST_DATABASE_URI"])
+        Base.metadata.create_all(engine)
+        try:
+            with engine.connect() as conn:
+                for name, query in HOT_QUERIES.items():
+                    plan = conn.execute(
+                        text("EXPLAIN " + compile_query(query, mysql.dialect()))
+                    ).mappings()
+                    for row in plan:
+                        self.assertNotEqual(row["type"], "ALL", f"{name}: {dict(row)}")
+        finally:
+            Base.metadata.drop_all(engine)
+            engine.dispose()
+
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            schema_migrations.drop(db.engine, checkfirst=True)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            schema_migrations.drop(db.engine, checkfirst=True)
+
+    def test_upgrade_legacy_database(self):
+        with self.app.app_context():
+            # Recreate the schema as it was before the migrations existed
+            with db.engine.begin() as conn:
+                conn.execute(text("DROP TABLE service_mechanics"))
+                conn.execute(text("DROP TABLE service_tickets_fts"))
+                for trigger in ("insert", "update", "delete"):
+                    conn.execute(text(f"DROP TRIGGER service_tickets_fts_{trigger}"))
+                conn.execute(text("DROP INDEX ix_service_tickets_customer_id"))
+                conn.execute(text('DROP INDEX "ix_service_tickets_VIN"'))
+                conn.execute(text("DROP INDEX ix_service_tickets_service_date"))
+                conn.execute(
+                    text(
+                        "CREATE TABLE service_mechanics ("
+                        "service_ticket_id INTEGER REFERENCES service_tickets (id), "
+                        "mechanic_id INTEGER REFERENCES mechanics (id))"
+                    )
+                )
+                conn.execute(
+                    text("INSERT INTO service_mechanics VALUES (1, 1), (1, 1), (1, 2)")
+                )
+                conn.execute(
+                    text(
+                        "INSERT INTO service_tickets "
+                        "(id, VIN, service_date, service_desc, customer_id) "
+                        "VALUES (1, '1hgcm82633a123456', '2030-12-10', 'tires', 1)"
+                    )
+                )
+
+            self.assertEqual(upgrade_db(), ALL_MIGRATIONS)
+            self.assertEqual(upgrade_db(), [])
+
+            inspector = inspect(db.engine)
+            self.assertEqual(
+                inspector.get_pk_constraint("service_mechanics")["constrained_columns"],
+                ["service_ticket_id", "mechanic_id"],
+            )
+            self.assertIn(
+                "ix_service_mechanics_mechanic_id",
+                {index["name"] for index in inspector.get_indexes("service_mechanics")},
+            )
+            self.assertTrue(
+                {
+                    "ix_service_tickets_customer_id",
+                    "ix_service_tickets_VIN",
+                    "ix_service_tickets_service_date",
+                }
+                <= {index["name"] for index in inspector.get_indexes("service_tickets")}
+            )
+
+            with db.engine.connect() as conn:
+                rows = conn.execute(select(service_mechanics)).all()
+                vin = conn.scalar(select(ServiceTicket.VIN))
+                found = conn.scalars(search_query(["tire"], "sqlite")).all()
+            self.assertEqual(sorted(rows), [(1, 1), (1, 2)])
+            self.assertEqual(vin, "1HGCM82633A123456")
+            self.assertEqual(found, [1])
+
+    def test_upgrade_is_a_no_op_on_a_new_database(self):
+        with self.app.app_context():
+            self.assertEqual(upgrade_db(), ALL_MIGRATIONS)
+            self.assertTrue(
+                inspect(db.engine).get_pk_constraint("service_mechanics")[
+                    "constrained_columns"
+                ]
+            )
+
+    def test_upgrade_creates_missing_tables(self):
+        with self.app.app_context():
+            db.drop_all()
+            self.assertEqual(upgrade_db(), ALL_MIGRATIONS)
+            self.assertTrue(inspect(db.engine).has_table("service_tickets"))
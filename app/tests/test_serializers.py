@@ -0,0 +1,115 @@
+from app import create_app
+from app.blueprints.customers.schemas import customers_schema, customers_serializer
+from app.blueprints.inventories.schemas import (
+    inventories_schema,
+    inventories_serializer,
+)
+from app.blueprints.mechanics.schemas import mechanics_schema, mechanics_serializer
+from app.blueprints.service_tickets.schemas import (
+    service_ticket_schema,
+    service_ticket_serializer,
+    service_tickets_schema,
+    service_tickets_serializer,
+)
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryServiceTicket,
+    Mechanic,
+    ServiceTicket,
+    db,
+)
+from app.utils.serializers import dumps
+import json
+import unittest
+from datetime import date
+from flask import jsonify
+
+# python -m unittest discover -s app/tests
+
+
+class TestCompiledSerializers(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+
+            mechanics = [
+                Mechanic(
+                    name="Taylor",
+                    email="taylor@gmail.com",
+                    phone="333-333-2222",
+                    password="password",
+                    salary=80000.5,
+                ),
+                Mechanic(
+                    name="Jörg",
+                    email="jorg@gmail.com",
+                    phone="333-333-4444",
+                    password="password",
+                    salary=75000,
+                ),
+            ]
+            customer = Customer(
+                name="Phil",
+                email="phil@gmail.com",
+                phone="333-333-2222",
+                password="password",
+            )
+            part = Inventory(part_name="Headlights", price=59.99, quantity=20)
+            ticket = ServiceTicket(
+                customer=customer,
+                VIN="1HGCM82633A123456",
+                service_date=date(2030, 12, 10),
+                service_desc="replace front brake pads, squeal on left",
+                mechanics=mechanics,
+            )
+            ticket.inventory_links = [
+                InventoryServiceTicket(inventory=part, quantity_used=2)
+            ]
+            bare_ticket = ServiceTicket(
+                customer=customer,
+                VIN="1HGCM82633A000000",
+                service_date=date(2030, 12, 11),
+                service_desc="engine is stalling",
+            )
+            db.session.add_all([ticket, bare_ticket])
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_matches_schema_dump(self):
+        pairs = [
+            (service_tickets_schema, service_tickets_serializer, ServiceTicket),
+            (mechanics_schema, mechanics_serializer, Mechanic),
+            (customers_schema, customers_serializer, Customer),
+            (inventories_schema, inventories_serializer, Inventory),
+        ]
+        with self.app.app_context():
+            for schema, serializer, model in pairs:
+                rows = db.session.query(model).all()
+                self.assertEqual(serializer.dump(rows), schema.dump(rows))
+
+            ticket = db.session.get(ServiceTicket, 1)
+            self.assertEqual(
+                service_ticket_serializer.dump(ticket),
+                service_ticket_schema.dump(ticket),
+            )
+
+    def test_json_matches_jsonify(self):
+        with self.app.test_request_context():
+            tickets = db.session.query(ServiceTicket).all()
+            expected = jsonify(service_tickets_schema.dump(tickets)).get_json()
+
+            self.assertEqual(
+                json.loads(dumps(service_tickets_serializer.dump(tickets))), expected
+            )
+            response = service_tickets_serializer.jsonify(tickets)
+            self.assertEqual(response.mimetype, "application/json")
+            self.assertEqual(response.get_json(), expected)
@@ -1,6 +1,17 @@
 from app import create_app
-from app.models import Mechanic, Inventory, ServiceTicket, db, Customer
+from app.models import (
+    Customer,
+    Inventory,
+    InventoryServiceTicket,
+    Mechanic,
+    ServiceTicket,
+    db,
+)
+import json
 import unittest
+from unittest import mock
+from datetime import date
+from sqlalchemy import event
 from app.tests.helper_function import login_mechanic, login_customer
 
 # python -m unittest discover -s app/tests
@@ -48,14 +59,14 @@ class TestServiceTickets(unittest.TestCase):
             service_ticket_1 = ServiceTicket(
                 customer_id=customer.id,
                 VIN="1HGCM82633A123456",
-                service_date="2030-12-10",
+                service_date=date(2030, 12, 10),
                 service_desc="needs a tire rotation",
                 mechanics=[mechanic],
             )
             service_ticket_2 = ServiceTicket(
                 customer_id=customer.id,
                 VIN="1HGCM82633A000000",
-                service_date="2030-12-10",
+                service_date=date(2030, 12, 17),
                 service_desc="engine is stalling",
                 mechanics=[mechanic],
             )
@@ -97,6 +108,118 @@ class TestServiceTickets(unittest.TestCase):
         self.assertEqual(response.status_code, 201)
         self.assertEqual(response.get_json()["VIN"], "1HGCM82633A123456")
 
+    def test_create_service_ticket_loads_mechanics_once(self):
+        service_ticket_payload = {
+            "customer_id": self.customer_id,
+            "VIN": "1HGCM82633A123456",
+            "service_date": "2030-12-10",
+            "service_desc": "balance all four tires",
+            "mechanic_ids": [self.mechanic_id],
+        }
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        statements = []
+        with self.app.app_context():
+            engine = db.engine
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = self.client.post(
+                "/service_tickets/", json=service_ticket_payload, headers=headers
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        self.assertEqual(response.status_code, 201)
+        mechanic_lookups = [s for s in statements if "mechanics.id IN" in s]
+        self.assertEqual(len(mechanic_lookups), 1)
+
+    def test_create_service_tickets_bulk(self):
+        payload = [
+            {
+                "customer_id": self.customer_id,
+                "VIN": "1HGCM82633A123456",
+                "service_date": "2030-12-10",
+                "service_desc": "balance all four tires",
+                "mechanic_ids": [self.mechanic_id],
+            },
+            {
+                "customer_id": self.customer_id,
+                "VIN": "1HGCM82633A654321",
+                "service_date": "2030-12-11",
+                "service_desc": "replace wiper blades",
+                "mechanic_ids": [self.mechanic_id],
+            },
+        ]
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.post(
+            "/service_tickets/bulk", json=payload, headers=headers
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()
+        self.assertEqual(data["created"], 2)
+        self.assertEqual(data["service_tickets"][1]["VIN"], "1HGCM82633A654321")
+        self.assertEqual(
+            data["service_tickets"][1]["mechanics"][0]["id"], self.mechanic_id
+        )
+
+    def test_create_service_tickets_bulk_reports_item_errors(self):
+        payload = [
+            {
+                "customer_id": self.customer_id,
+                "VIN": "1HGCM82633A123456",
+                "service_date": "2030-12-10",
+                "service_desc": "balance all four tires",
+                "mechanic_ids": [self.mechanic_id],
+            },
+            {
+                "customer_id": self.customer_id,
+                "VIN": "1HGCM82633A654321",
+                "service_date": "2030-12-11",
+                "service_desc": "replace wiper blades",
+                "mechanic_ids": [self.mechanic_id, 999],
+            },
+        ]
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.post(
+            "/service_tickets/bulk", json=payload, headers=headers
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(),
+            {
+                "errors": {
+                    "1": {"mechanic_ids": ["One or more mechanic IDs are invalid"]}
+                }
+            },
+        )
+
+        with self.app.app_context():
+            self.assertEqual(db.session.query(ServiceTicket).count(), 2)
+
     def test_create_service_ticket_as_customer(self):
         service_ticket_payload = {
             "customer_id": self.customer_id,
@@ -130,7 +253,287 @@ class TestServiceTickets(unittest.TestCase):
 
         response = self.client.get("/service_tickets/", headers=headers)
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.get_json()[0]["VIN"], "1HGCM82633A123456")
+        data = response.get_json()
+        self.assertEqual(data["service_tickets"][0]["VIN"], "1HGCM82633A123456")
+        self.assertEqual(data["service_tickets"][0]["mechanics"][0]["name"], "Taylor")
+        self.assertIsNone(data["next_after_id"])
+
+    def test_get_service_tickets_paginated(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get("/service_tickets/?limit=1", headers=headers)
+        data = response.get_json()
+        self.assertEqual(len(data["service_tickets"]), 1)
+        self.assertEqual(data["service_tickets"][0]["id"], self.service_ticket_id_1)
+        self.assertEqual(data["next_after_id"], self.service_ticket_id_1)
+
+        response = self.client.get(
+            f"/service_tickets/?limit=1&after_id={data['next_after_id']}",
+            headers=headers,
+        )
+        data = response.get_json()
+        self.assertEqual(data["service_tickets"][0]["id"], self.service_ticket_id_2)
+        self.assertIsNone(data["next_after_id"])
+
+        # Paging past the last ticket is an empty page, not the no tickets message
+        response = self.client.get(
+            f"/service_tickets/?after_id={self.service_ticket_id_2}", headers=headers
+        )
+        data = response.get_json()
+        self.assertEqual(data["service_tickets"], [])
+        self.assertIsNone(data["next_after_id"])
+
+    def test_get_service_tickets_filtered(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get(
+            "/service_tickets/?from=2030-12-14&to=2030-12-20", headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+        tickets = response.get_json()["service_tickets"]
+        self.assertEqual([t["id"] for t in tickets], [self.service_ticket_id_2])
+        self.assertEqual(tickets[0]["service_date"], "2030-12-17")
+
+        response = self.client.get(
+            f"/service_tickets/?to=2030-12-10&mechanic_id={self.mechanic_id}"
+            f"&customer_id={self.customer_id}",
+            headers=headers,
+        )
+        tickets = response.get_json()["service_tickets"]
+        self.assertEqual([t["id"] for t in tickets], [self.service_ticket_id_1])
+
+        response = self.client.get(
+            f"/service_tickets/?mechanic_id={self.mechanic_id + 1}", headers=headers
+        )
+        self.assertEqual(response.get_json()["service_tickets"], [])
+
+    def test_get_service_tickets_invalid_date_filter(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get("/service_tickets/?from=12/14/2030", headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json()["error"], "from and to must be in format YYYY-MM-DD"
+        )
+
+    def test_get_service_tickets_by_vin(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get(
+            "/service_tickets/by-vin/1hgcm82633a123456", headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+        tickets = response.get_json()["service_tickets"]
+        self.assertEqual([t["id"] for t in tickets], [self.service_ticket_id_1])
+
+        # Prefix search, newest service date first, one ticket per page
+        response = self.client.get(
+            "/service_tickets/by-vin/1HGCM?limit=1", headers=headers
+        )
+        data = response.get_json()
+        self.assertEqual(data["service_tickets"][0]["id"], self.service_ticket_id_2)
+        self.assertEqual(data["next_cursor"], f"2030-12-17:{self.service_ticket_id_2}")
+
+        response = self.client.get(
+            f"/service_tickets/by-vin/1HGCM?limit=1&cursor={data['next_cursor']}",
+            headers=headers,
+        )
+        data = response.get_json()
+        self.assertEqual(data["service_tickets"][0]["id"], self.service_ticket_id_1)
+        self.assertIsNone(data["next_cursor"])
+
+    def test_get_service_tickets_sparse_fields(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = self.client.get(
+                "/service_tickets/?fields=id,VIN,service_date", headers=headers
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+
+        self.assertEqual(response.status_code, 200)
+        tickets = response.get_json()["service_tickets"]
+        self.assertEqual(
+            tickets[0],
+            {
+                "id": self.service_ticket_id_1,
+                "VIN": "1HGCM82633A123456",
+                "service_date": "2030-12-10",
+            },
+        )
+        # Neither the description nor the nested collections are queried
+        ticket_queries = [s for s in statements if "service_tickets" in s]
+        self.assertEqual(len(ticket_queries), 1)
+        self.assertNotIn("service_desc", ticket_queries[0])
+        self.assertFalse(any("service_mechanics" in s for s in statements))
+
+        response = self.client.get(
+            f"/service_tickets/{self.service_ticket_id_2}?fields=mechanics",
+            headers=headers,
+        )
+        self.assertEqual(
+            response.get_json(),
+            {"mechanics": [{"id": self.mechanic_id, "name": "Taylor"}]},
+        )
+
+        # by-vin still builds its cursor from service_date
+        response = self.client.get(
+            "/service_tickets/by-vin/1HGCM?limit=1&fields=id", headers=headers
+        )
+        data = response.get_json()
+        self.assertEqual(data["service_tickets"], [{"id": self.service_ticket_id_2}])
+        self.assertEqual(data["next_cursor"], f"2030-12-17:{self.service_ticket_id_2}")
+
+    def test_get_service_tickets_unknown_fields(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get("/service_tickets/?fields=id,owner", headers=headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Unknown fields: owner")
+        self.assertIn("VIN", response.get_json()["fields"])
+
+        # Write-only input, there's nothing to return for it
+        response = self.client.get(
+            "/service_tickets/?fields=mechanic_ids", headers=headers
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["error"], "Unknown fields: mechanic_ids")
+        self.assertNotIn("mechanic_ids", response.get_json()["fields"])
+
+    def test_get_service_tickets_by_vin_invalid(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        for vin in ("1H", "1HGCM82633A12345O"):
+            response = self.client.get(
+                f"/service_tickets/by-vin/{vin}", headers=headers
+            )
+            self.assertEqual(response.status_code, 400)
+
+    def test_search_service_tickets(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get("/service_tickets/search?q=Tire", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(
+            [t["id"] for t in data["service_tickets"]], [self.service_ticket_id_1]
+        )
+        self.assertIsNone(data["next_page"])
+
+        # The index follows update-info and delete
+        self.client.put(
+            f"/service_tickets/{self.service_ticket_id_2}/update-info",
+            json={"service_desc": "tire pressure warning, engine stalls"},
+            headers=headers,
+        )
+        response = self.client.get(
+            "/service_tickets/search?q=tire&limit=1", headers=headers
+        )
+        data = response.get_json()
+        self.assertEqual(len(data["service_tickets"]), 1)
+        self.assertEqual(data["next_page"], 2)
+
+        response = self.client.get(
+            "/service_tickets/search?q=stalling", headers=headers
+        )
+        self.assertEqual(
+            [t["id"] for t in response.get_json()["service_tickets"]],
+            [self.service_ticket_id_2],
+        )
+
+        self.client.delete(
+            f"/service_tickets/{self.service_ticket_id_2}", headers=headers
+        )
+        response = self.client.get("/service_tickets/search?q=engine", headers=headers)
+        self.assertEqual(response.get_json()["service_tickets"], [])
+
+    def test_search_service_tickets_without_words(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get('/service_tickets/search?q="*', headers=headers)
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_service_tickets(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.get("/service_tickets/export", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+
+        tickets = [
+            json.loads(line) for line in response.get_data(as_text=True).splitlines()
+        ]
+        self.assertEqual(
+            [ticket["id"] for ticket in tickets],
+            [self.service_ticket_id_1, self.service_ticket_id_2],
+        )
+        self.assertEqual(tickets[1]["service_desc"], "engine is stalling")
+        self.assertEqual(tickets[1]["mechanics"][0]["name"], "Taylor")
+
+        # Batches continue after the last id of the previous one
+        with mock.patch("app.blueprints.service_tickets.routes.EXPORT_BATCH_SIZE", 1):
+            response = self.client.get("/service_tickets/export", headers=headers)
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], tickets)
 
     def test_get_service_ticket(self):
         headers = {
@@ -150,7 +553,38 @@ class TestServiceTickets(unittest.TestCase):
     def test_get_mechanic_with_most_service_tickets(self):
         response = self.client.get("/service_tickets/most-tickets")
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.get_json()[0]["email"], self.mechanic_email)
+        data = response.get_json()
+        self.assertEqual(data["mechanics"][0]["email"], self.mechanic_email)
+        self.assertEqual(data["mechanics"][0]["ticket_count"], 2)
+        self.assertIsNone(data["next_cursor"])
+
+    def test_get_mechanic_with_most_service_tickets_paginated(self):
+        with self.app.app_context():
+            idle_mechanic = Mechanic(
+                name="Jordan",
+                email="jordan@gmail.com",
+                phone="333-333-7777",
+                password="password",
+                salary=60000,
+            )
+            db.session.add(idle_mechanic)
+            db.session.commit()
+            idle_mechanic_id = idle_mechanic.id
+
+        response = self.client.get("/service_tickets/most-tickets?limit=1")
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(len(data["mechanics"]), 1)
+        self.assertEqual(data["mechanics"][0]["id"], self.mechanic_id)
+        self.assertEqual(data["next_cursor"], f"2:{self.mechanic_id}")
+
+        response = self.client.get(
+            f"/service_tickets/most-tickets?limit=1&cursor={data['next_cursor']}"
+        )
+        data = response.get_json()
+        self.assertEqual(data["mechanics"][0]["id"], idle_mechanic_id)
+        self.assertEqual(data["mechanics"][0]["ticket_count"], 0)
+        self.assertIsNone(data["next_cursor"])
 
     def test_update_service_ticket_part(self):
         service_ticket_parts_payload = {
@@ -178,6 +612,150 @@ class TestServiceTickets(unittest.TestCase):
             f"{self.service_ticket_id_2} {self.inventory_part_name}(s) added",
         )
 
+    def test_update_service_ticket_part_invalidates_cached_reads(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+        part_url = f"/inventories/{self.inventory_part_id}"
+        ticket_url = f"/service_tickets/{self.service_ticket_id_2}"
+
+        self.assertEqual(self.client.get(part_url).get_json()["quantity"], 20)
+        ticket = self.client.get(ticket_url, headers=headers).get_json()
+        self.assertEqual(ticket["inventory_links"], [])
+
+        # Stock and part links change through UPDATE/INSERT statements
+        self.client.put(
+            f"{ticket_url}/update-parts",
+            json={"inventory_id": self.inventory_part_id, "quantity_used": 2},
+            headers=headers,
+        )
+
+        self.assertEqual(self.client.get(part_url).get_json()["quantity"], 18)
+        ticket = self.client.get(ticket_url, headers=headers).get_json()
+        self.assertEqual(ticket["inventory_links"][0]["quantity_used"], 2)
+
+    def test_update_service_ticket_part_not_enough_stock(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.put(
+            f"/service_tickets/{self.service_ticket_id_2}/update-parts",
+            json={"inventory_id": self.inventory_part_id, "quantity_used": 21},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(),
+            {"error": f"Not enough {self.inventory_part_name}s in inventory"},
+        )
+
+        with self.app.app_context():
+            self.assertEqual(
+                db.session.get(Inventory, self.inventory_part_id).quantity, 20
+            )
+
+    def test_update_service_ticket_part_use_and_return(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+        url = f"/service_tickets/{self.service_ticket_id_2}/update-parts"
+
+        self.client.put(
+            url,
+            json={"inventory_id": self.inventory_part_id, "quantity_used": 5},
+            headers=headers,
+        )
+        self.client.put(
+            url,
+            json={"inventory_id": self.inventory_part_id, "quantity_used": 3},
+            headers=headers,
+        )
+        response = self.client.put(
+            url,
+            json={"inventory_id": self.inventory_part_id, "quantity_returned": 9},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.put(
+            url,
+            json={"inventory_id": self.inventory_part_id, "quantity_returned": 2},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json()["message"], f"2 {self.inventory_part_name}(s) removed"
+        )
+
+        with self.app.app_context():
+            self.assertEqual(
+                db.session.get(Inventory, self.inventory_part_id).quantity, 14
+            )
+            link = db.session.get(
+                InventoryServiceTicket,
+                (self.service_ticket_id_2, self.inventory_part_id),
+            )
+            self.assertEqual(link.quantity_used, 6)
+
+    def test_update_service_ticket_many_parts(self):
+        with self.app.app_context():
+            brake_pads = Inventory(part_name="Brake Pads", price=39.99, quantity=4)
+            db.session.add(brake_pads)
+            db.session.commit()
+            brake_pads_id = brake_pads.id
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+        url = f"/service_tickets/{self.service_ticket_id_2}/update-parts"
+
+        response = self.client.put(
+            url,
+            json=[
+                {"inventory_id": self.inventory_part_id, "quantity_used": 2},
+                {"inventory_id": brake_pads_id, "quantity_used": 4},
+            ],
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json()["message"],
+            "2 Headlights(s) added, 4 Brake Pads(s) added",
+        )
+
+        # The second change fails, so the first one is rolled back too
+        response = self.client.put(
+            url,
+            json=[
+                {"inventory_id": self.inventory_part_id, "quantity_used": 1},
+                {"inventory_id": brake_pads_id, "quantity_used": 1},
+            ],
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.get_json(), {"error": "Not enough Brake Padss in inventory"}
+        )
+
+        with self.app.app_context():
+            self.assertEqual(
+                db.session.get(Inventory, self.inventory_part_id).quantity, 18
+            )
+            self.assertEqual(db.session.get(Inventory, brake_pads_id).quantity, 0)
+
     def test_update_service_ticket_mechanics(self):
         service_ticket_mechanics_payload = {
             "add_mechanic_ids": [],
@@ -204,6 +782,40 @@ class TestServiceTickets(unittest.TestCase):
             },
         )
 
+    def test_update_service_ticket_mechanics_swap(self):
+        with self.app.app_context():
+            new_mechanic = Mechanic(
+                name="Jordan",
+                email="jordan@gmail.com",
+                phone="333-333-7777",
+                password="password",
+                salary=60000,
+            )
+            db.session.add(new_mechanic)
+            db.session.commit()
+            new_mechanic_id = new_mechanic.id
+
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.put(
+            f"/service_tickets/{self.service_ticket_id_2}/update-mechanics",
+            json={
+                "add_mechanic_ids": [new_mechanic_id],
+                "remove_mechanic_ids": [self.mechanic_id],
+            },
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.get_json()["mechanics"],
+            [{"id": new_mechanic_id, "name": "Jordan"}],
+        )
+
     def test_update_service_ticket_info(self):
         service_ticket_info_payload = {
             "VIN": "1HGCM82633A789101",
@@ -226,6 +838,22 @@ class TestServiceTickets(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.get_json()["VIN"], "1HGCM82633A789101")
 
+    def test_update_service_ticket_info_uppercases_vin(self):
+        headers = {
+            "Authorization": "Bearer "
+            + login_mechanic(
+                self.client, email=self.mechanic_email, password=self.mechanic_password
+            )
+        }
+
+        response = self.client.put(
+            f"/service_tickets/{self.service_ticket_id_2}/update-info",
+            json={"VIN": "1hgcm82633a789101"},
+            headers=headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["VIN"], "1HGCM82633A789101")
+
     def test_update_service_ticket_info_invalid_vin(self):
         service_ticket_info_payload = {
             "VIN": "1HG",
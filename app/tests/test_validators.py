@@ -0,0 +1,205 @@
+from app import create_app
+from app.blueprints.inventories.schemas import (
+    inventories_service_ticket_schema,
+    inventories_service_ticket_validator,
+    inventory_service_ticket_schema,
+    inventory_service_ticket_validator,
+)
+from app.blueprints.service_tickets.schemas import (
+    edit_service_ticket_info_schema,
+    edit_service_ticket_info_validator,
+    edit_service_ticket_mechanics_schema,
+    edit_service_ticket_mechanics_validator,
+    service_ticket_schema,
+    service_ticket_validator,
+)
+from app.models import Customer, Mechanic, db
+import copy
+import unittest
+from marshmallow import ValidationError
+from sqlalchemy import event
+
+# python -m unittest discover -s app/tests
+
+VALID_TICKET = {
+    "customer_id": 1,
+    "VIN": "1HGCM82633A123456",
+    "service_date": "2030-12-12",
+    "service_desc": "Oil change",
+    "mechanic_ids": [1, 2],
+}
+
+TICKET_PAYLOADS = [
+    VALID_TICKET,
+    {},
+    {**VALID_TICKET, "VIN": "  1hgcm82633a123456 ", "service_desc": " Tires  "},
+    {**VALID_TICKET, "customer_id": "1", "mechanic_ids": ["1", 2.0]},
+    {**VALID_TICKET, "customer_id": None, "VIN": None, "mechanic_ids": None},
+    {**VALID_TICKET, "customer_id": True, "mechanic_ids": [1, False]},
+    {**VALID_TICKET, "customer_id": 1.5, "mechanic_ids": [1, "x", None]},
+    {**VALID_TICKET, "customer_id": 99, "mechanic_ids": [1, 99]},
+    {**VALID_TICKET, "customer_id": 0, "mechanic_ids": []},
+    {**VALID_TICKET, "mechanic_ids": "1"},
+    {**VALID_TICKET, "VIN": "1HGCM", "service_desc": "abc"},
+    {**VALID_TICKET, "VIN": "1HGCM82633A12345O" * 20, "service_desc": ""},
+    {**VALID_TICKET, "VIN": 12345, "service_desc": ["Oil change"]},
+    {**VALID_TICKET, "service_date": "2030-02-31"},
+    {**VALID_TICKET, "service_date": "12/10/2030"},
+    {**VALID_TICKET, "service_date": "2000-01-01"},
+    {**VALID_TICKET, "service_date": "  "},
+    {**VALID_TICKET, "service_date": 20301210},
+    {**VALID_TICKET, "owner": "Phil", "mechanics": []},
+    {**VALID_TICKET, "id": 7, "ticket_id": "8"},
+    ["not", "a", "ticket"],
+]
+
+EDIT_INFO_PAYLOADS = [
+    {},
+    {"VIN": "bad vin"},
+    {"service_date": "2030-12-12", "service_desc": "  new brakes "},
+    {"service_date": None, "mechanic_ids": [1]},
+]
+
+EDIT_MECHANICS_PAYLOADS = [
+    {"add_mechanic_ids": [2], "remove_mechanic_ids": [1]},
+    {"add_mechanic_ids": [99], "remove_mechanic_ids": []},
+    {"add_mechanic_ids": [1]},
+    {"add_mechanic_ids": "2", "remove_mechanic_ids": [None]},
+]
+
+PART_PAYLOADS = [
+    {"inventory_id": 1, "quantity_used": 2},
+    {"inventory_id": 1, "quantity_returned": 1},
+    {"inventory_id": 1},
+    {"inventory_id": 1, "quantity_used": -1, "quantity_returned": 0},
+    {"quantity_used": 1},
+    {"inventory_id": "x", "quantity_used": 1, "part_name": "Headlights"},
+]
+
+PARTS_PAYLOADS = [
+    [{"inventory_id": 1, "quantity_used": 2}, {"inventory_id": 2}],
+    [{"inventory_id": 1}, {"inventory_id": 2, "quantity_returned": -3}],
+    # A field error on one item skips the quantity checks on every item
+    [{"inventory_id": "x", "quantity_used": 1}, {"inventory_id": 2}],
+    [{"inventory_id": 1, "quantity_used": 1}, 5],
+    [],
+    {"inventory_id": 1, "quantity_used": 2},
+]
+
+
+def outcome(load, payload, **kwargs):
+    try:
+        return "loaded", load(copy.deepcopy(payload), **kwargs)
+    except ValidationError as e:
+        return "invalid", e.messages
+    except Exception as e:
+        return "raised", type(e)
+
+
+class TestCompiledValidators(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app("TestingConfig")
+        self.app.testing = True
+
+        with self.app.app_context():
+            db.drop_all()
+            db.create_all()
+            db.session.add_all(
+                [
+                    Customer(
+                        name="Phil",
+                        email="phil@gmail.com",
+                        phone="333-333-2222",
+                        password="password",
+                    ),
+                    Mechanic(
+                        name="Taylor",
+                        email="taylor@gmail.com",
+                        phone="333-333-2222",
+                        password="password",
+                        salary=80000,
+                    ),
+                    Mechanic(
+                        name="Jerry",
+                        email="jerry@gmail.com",
+                        phone="333-333-4444",
+                        password="password",
+                        salary=70000,
+                    ),
+                ]
+            )
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def assertMatchesSchema(self, schema, validator, payloads, **kwargs):
+        for payload in payloads:
+            # A new request each time, so no lookups are shared between them
+            with self.app.test_request_context():
+                expected = outcome(schema.load, payload, **kwargs)
+            with self.app.test_request_context():
+                compiled = outcome(validator.load, payload, **kwargs)
+            self.assertEqual(compiled, expected, payload)
+
+    def test_matches_schema_load(self):
+        self.assertMatchesSchema(
+            service_ticket_schema, service_ticket_validator, TICKET_PAYLOADS
+        )
+        self.assertMatchesSchema(
+            edit_service_ticket_info_schema,
+            edit_service_ticket_info_validator,
+            EDIT_INFO_PAYLOADS,
+            partial=True,
+        )
+        self.assertMatchesSchema(
+            edit_service_ticket_mechanics_schema,
+            edit_service_ticket_mechanics_validator,
+            EDIT_MECHANICS_PAYLOADS,
+        )
+        self.assertMatchesSchema(
+            inventory_service_ticket_schema,
+            inventory_service_ticket_validator,
+            PART_PAYLOADS,
+        )
+        self.assertMatchesSchema(
+            inventories_service_ticket_schema,
+            inventories_service_ticket_validator,
+            PARTS_PAYLOADS,
+        )
+
+    def test_load_batch_queries_each_model_once(self):
+        payload = [
+            {**VALID_TICKET, "customer_id": 1, "mechanic_ids": [1]},
+            {**VALID_TICKET, "customer_id": 2, "mechanic_ids": [2, 3]},
+            {**VALID_TICKET, "service_date": "2030-13-01", "mechanic_ids": [1]},
+            "not a ticket",
+        ]
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with self.app.test_request_context():
+            engine = db.engine
+            event.listen(engine, "before_cursor_execute", record)
+            try:
+                tickets, errors = service_ticket_validator.load_batch(payload)
+            finally:
+                event.remove(engine, "before_cursor_execute", record)
+
+        self.assertEqual(len(statements), 2)
+        self.assertEqual([t["customer_id"] for t in tickets], [1])
+        self.assertEqual(
+            errors,
+            {
+                1: {
+                    "customer_id": ["Customer with ID 2 does not exist"],
+                    "mechanic_ids": ["One or more mechanic IDs are invalid"],
+                },
+                2: {"service_date": ["Service date must be in format YYYY-MM-DD"]},
+                3: {"_schema": ["Invalid input type."]},
+            },
+        )
@@ -0,0 +1,70 @@
+# app/utils/compression.py
+# Negotiated gzip/brotli compression of JSON responses.
+#
+# compress_response() runs after every request and compresses bodies of at
+# least COMPRESS_MIN_SIZE bytes with the best coding the client accepts.
+# Responses served by cached_response are compressed there instead, once
+# per cache entry and coding, and arrive here already encoded.
+import gzip
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+# Preferred first when the client accepts both equally
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSIBLE_MIMETYPES = {"application/json"}
+
+
+def negotiate_encoding(mimetype, size):
+    """Content coding to send a body of size bytes in, None to send it as is"""
+    if mimetype not in COMPRESSIBLE_MIMETYPES:
+        return None
+    if size < current_app.config.get("COMPRESS_MIN_SIZE", 1024):
+        return None
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(data, encoding):
+    config = current_app.config
+    if encoding == "br":
+        return brotli.compress(data, quality=config.get("COMPRESS_BROTLI_LEVEL", 4))
+    # mtime=0 so the same body always compresses to the same bytes
+    return gzip.compress(
+        data, compresslevel=config.get("COMPRESS_GZIP_LEVEL", 6), mtime=0
+    )
+
+
+def encoded_etag(etag, encoding):
+    """Each coding of a body is a different representation with its own ETag"""
+    return f"{etag}-{encoding}"
+
+
+def set_encoded_body(response, data, encoding):
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(encoded_etag(etag, encoding), weak)
+
+
+def compress_response(response):
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    encoding = negotiate_encoding(response.mimetype, len(data))
+    if encoding:
+        set_encoded_body(response, compress(data, encoding), encoding)
+    return response
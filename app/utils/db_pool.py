@@ -0,0 +1,135 @@
+# app/utils/db_pool.py
+# Connection pool setup and telemetry for the app's SQLAlchemy engines.
+#
+# Pool sizing, pre-ping and recycling come from SQLALCHEMY_ENGINE_OPTIONS in
+# config.py. On top of that every engine gets a per-connection statement
+# timeout, counters fed by the pool events for the internal metrics endpoint,
+# and is disposed in forked children so gunicorn workers started from a
+# preloaded app open their own connections instead of sharing the parent's.
+import os
+import threading
+import weakref
+from flask import current_app
+from sqlalchemy import event
+from app.models import db
+
+# Per-session statement timeout, in milliseconds
+STATEMENT_TIMEOUT_SQL = {
+    # Only applies to SELECT statements on MySQL
+    "mysql": "SET SESSION max_execution_time = {:d}",
+    "postgresql": "SET statement_timeout = {:d}",
+}
+
+_tracked = weakref.WeakSet()
+
+
+class PoolStats:
+    """Counts of one engine's pool events since the process started"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+
+    def on_connect(self, *args):
+        with self._lock:
+            self.connects += 1
+
+    def on_checkout(self, *args):
+        pool = self.engine.pool
+        with self._lock:
+            self.checkouts += 1
+            if hasattr(pool, "overflow"):
+                self.peak_checked_out = max(self.peak_checked_out, pool.checkedout())
+                self.peak_overflow = max(self.peak_overflow, pool.overflow())
+
+    def on_checkin(self, *args):
+        with self._lock:
+            self.checkins += 1
+
+    def on_invalidate(self, *args):
+        with self._lock:
+            self.invalidations += 1
+
+    def stats(self):
+        # The engine gets a new pool when it's disposed
+        pool = self.engine.pool
+        stats = {
+            "pool": type(pool).__name__,
+            "connects": self.connects,
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "invalidations": self.invalidations,
+        }
+        if hasattr(pool, "overflow"):
+            # QueuePool, the other pools don't keep these numbers
+            stats.update(
+                {
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": pool.checkedout(),
+                    "overflow": pool.overflow(),
+                    "peak_checked_out": self.peak_checked_out,
+                    "peak_overflow": self.peak_overflow,
+                }
+            )
+        return stats
+
+
+def _set_statement_timeout(engine, timeout_ms):
+    statement = STATEMENT_TIMEOUT_SQL.get(engine.dialect.name)
+    if not statement or not timeout_ms:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_timeout(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(statement.format(timeout_ms))
+        finally:
+            cursor.close()
+
+
+def _track(engine):
+    stats = PoolStats(engine)
+    for name in ("connect", "checkout", "checkin", "invalidate"):
+        event.listen(engine, name, getattr(stats, f"on_{name}"))
+    return stats
+
+
+def init_pool(app):
+    """Statement timeout, pool stats and after-fork disposal for app's engines"""
+    with app.app_context():
+        engines = dict(db.engines)
+
+    pool_stats = app.extensions.setdefault("pool_stats", {})
+    for bind_key, engine in engines.items():
+        _set_statement_timeout(engine, app.config.get("DB_STATEMENT_TIMEOUT_MS"))
+        stats = pool_stats[bind_key or "default"] = _track(engine)
+        _tracked.add(stats)
+
+
+def pool_metrics():
+    """Pool stats of each of the current app's engines, by bind key"""
+    pool_stats = current_app.extensions.get("pool_stats", {})
+    return {name: stats.stats() for name, stats in pool_stats.items()}
+
+
+def dispose_engines_after_fork():
+    # close=False leaves the parent's connections alone, the child just
+    # forgets them and opens new ones
+    for stats in list(_tracked):
+        stats.engine.dispose(close=False)
+        stats.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=dispose_engines_after_fork)
@@ -0,0 +1,54 @@
+# app/utils/fieldsets.py
+# Sparse fieldsets: ?fields=id,name narrows the columns a read endpoint
+# SELECTs and the fields its serializer dumps.
+from flask import abort, jsonify, make_response, request
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+
+
+def requested_fields(schema):
+    """
+    Field names from ?fields= (comma separated) as a frozenset, None when
+    the parameter isn't given. Names the schema doesn't dump are a 400.
+    """
+    value = request.args.get("fields")
+    if value is None:
+        return None
+
+    fields = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = fields - schema.dump_fields.keys()
+    if not fields or unknown:
+        error = "Unknown fields: " + ", ".join(sorted(unknown))
+        if not fields:
+            error = "fields cannot be empty"
+        abort(
+            make_response(
+                jsonify({"error": error, "fields": sorted(schema.dump_fields)}), 400
+            )
+        )
+    return fields
+
+
+def column_options(model, fields, relationship_loads=None, always=()):
+    """
+    Loader options for a query on model: load_only() the requested columns
+    (the primary key is always loaded) and keep only the relationship loads
+    for requested relationships. Everything is loaded when fields is None.
+    """
+    relationship_loads = relationship_loads or {}
+    if fields is None:
+        return list(relationship_loads.values())
+
+    mapper = inspect(model)
+    columns = mapper.column_attrs.keys()
+    wanted = [getattr(model, name) for name in (*fields, *always) if name in columns]
+    if not wanted:
+        # Only relationships asked for, load_only() needs at least one column
+        wanted = [
+            getattr(model, mapper.get_property_by_column(column).key)
+            for column in mapper.primary_key
+        ]
+
+    options = [load_only(*wanted)]
+    options += [load for name, load in relationship_loads.items() if name in fields]
+    return options
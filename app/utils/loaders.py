@@ -0,0 +1,51 @@
+# app/utils/loaders.py
+from flask import g
+from sqlalchemy import select
+from app.models import db
+
+
+class IdentityLoader:
+    """
+    Request-scoped batch loader for one model.
+    Ids queued with prime() or asked for with load_many() are fetched together
+    in a single IN query, later lookups are answered from memory.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._rows = {}
+        self._queued = set()
+
+    def prime(self, ids):
+        """Queue ids for the next fetch without querying yet"""
+        self._queued.update(
+            i
+            for i in ids
+            if isinstance(i, int) and not isinstance(i, bool) and i not in self._rows
+        )
+
+    def load_many(self, ids):
+        """Return {id: row} for the ids that exist"""
+        ids = list(ids)
+        self.prime(ids)
+
+        if self._queued:
+            query = select(self.model).where(self.model.id.in_(self._queued))
+            for row in db.session.execute(query).scalars():
+                self._rows[row.id] = row
+            for missing_id in self._queued - self._rows.keys():
+                self._rows[missing_id] = None
+            self._queued.clear()
+
+        return {i: self._rows[i] for i in ids if self._rows.get(i) is not None}
+
+    def load(self, id):
+        return self.load_many([id]).get(id)
+
+
+def get_loader(model):
+    """The IdentityLoader for model, shared by everything in the current request"""
+    loaders = g.setdefault("identity_loaders", {})
+    if model not in loaders:
+        loaders[model] = IdentityLoader(model)
+    return loaders[model]
@@ -0,0 +1,11 @@
+# app/utils/pagination.py
+from flask import request
+
+DEFAULT_LIMIT = 25
+MAX_LIMIT = 100
+
+
+def get_limit(default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """Read ?limit= from the query string, clamped to 1..maximum."""
+    limit = request.args.get("limit", default=default, type=int)
+    return max(1, min(limit, maximum))
@@ -0,0 +1,255 @@
+# app/utils/response_cache.py
+# Response cache on top of app.extensions.cache, invalidated by tags.
+#
+# Every cached view lists the tables (tags) its payload is built from. Each
+# tag has a version stored in the cache backend, and the versions are part of
+# the entry's key. Committing a change to a table gives its tag a new version,
+# so every entry built from the old data stops matching in every worker that
+# shares the backend, without having to find and delete the entries.
+#
+# The same key, hashed, is the response's ETag. A poll sending it back in
+# If-None-Match gets a 304 after a single lookup of the tag versions, before
+# the entry is read or anything is queried or serialized.
+#
+# Misses are computed once per key and process (single flight), entries are
+# refreshed a little before they expire (probabilistic early refresh) and
+# their timeouts are jittered, so a popular entry expiring doesn't send every
+# concurrent request to the database at once.
+#
+# Compressed copies of an entry are cached next to it, one per content coding,
+# so a hit doesn't compress the same body again.
+import hashlib
+import math
+import random
+import threading
+import time
+import weakref
+from functools import wraps
+from flask import current_app, has_app_context, make_response, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.extensions import cache
+from app.utils.compression import (
+    ENCODINGS,
+    compress,
+    encoded_etag,
+    negotiate_encoding,
+    set_encoded_body,
+)
+
+TAG_KEY = "tag:{}"
+
+# A stuck computation stops holding up the other requests after this long
+SINGLE_FLIGHT_TIMEOUT = 10
+
+# Join tables only show up nested inside service ticket payloads
+TABLE_TAGS = {
+    "service_mechanics": "service_tickets",
+    "inventory_service_tickets": "service_tickets",
+}
+
+
+def tag_versions(tags):
+    """Current version of each tag, a tag missing from the backend gets a new one"""
+    keys = [TAG_KEY.format(tag) for tag in tags]
+    versions = cache.get_many(*keys)
+
+    for i, version in enumerate(versions):
+        if version is None:
+            # An evicted tag must not come back as a version seen before
+            cache.add(keys[i], time.time_ns(), timeout=0)
+            versions[i] = cache.get(keys[i])
+    return versions
+
+
+def invalidate(*tags):
+    """Give each tag a new version, dropping every response built from it"""
+    if tags:
+        cache.set_many({TAG_KEY.format(tag): time.time_ns() for tag in tags}, timeout=0)
+
+
+def _cache_key(tags):
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    versions = ".".join(str(version) for version in tag_versions(tags))
+    return f"view:{request.endpoint}:{request.path}?{query}:{versions}"
+
+
+class _Flight:
+    __slots__ = ("lock", "__weakref__")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+
+_flights = weakref.WeakValueDictionary()
+_flights_guard = threading.Lock()
+
+
+def _flight(key):
+    with _flights_guard:
+        flight = _flights.get(key)
+        if flight is None:
+            flight = _flights[key] = _Flight()
+        return flight
+
+
+def _refresh_early(computed_in, expires_at):
+    """
+    XFetch: refresh with a probability that rises as expiry gets closer,
+    sooner for entries that are slow to compute. 0 disables it.
+    """
+    beta = current_app.config.get("CACHE_EARLY_REFRESH", 1.0)
+    if not beta or not expires_at:
+        return False
+    return time.time() - computed_in * beta * math.log(1.0 - random.random()) >= (
+        expires_at
+    )
+
+
+def _jittered(timeout):
+    """Shorten timeout by up to CACHE_TTL_JITTER of itself, 0 (never) stays 0"""
+    jitter = current_app.config.get("CACHE_TTL_JITTER", 0.1)
+    if not timeout:
+        return timeout
+    return max(1, int(timeout * (1 - jitter * random.random())))
+
+
+def get_or_compute(key, compute, timeout, cacheable=None):
+    """
+    Cached value of key, calling compute() to fill it on a miss.
+    Concurrent misses in this process wait for the first one's result
+    instead of all calling compute(). Values failing cacheable are returned
+    without being stored.
+    """
+    entry = cache.get(key)
+    if entry is not None:
+        value, computed_in, expires_at = entry
+        if not _refresh_early(computed_in, expires_at):
+            return value
+
+    flight = _flight(key)
+    if entry is not None:
+        # Early refresh, whoever gets the lock recomputes and the rest keep
+        # using the current entry
+        if not flight.lock.acquire(blocking=False):
+            return entry[0]
+        locked = True
+    else:
+        locked = flight.lock.acquire(timeout=SINGLE_FLIGHT_TIMEOUT)
+        entry = cache.get(key)
+        if entry is not None:
+            if locked:
+                flight.lock.release()
+            return entry[0]
+
+    try:
+        started = time.monotonic()
+        value = compute()
+        if cacheable is None or cacheable(value):
+            ttl = _jittered(timeout)
+            expires_at = time.time() + ttl if ttl else 0
+            cache.set(key, (value, time.monotonic() - started, expires_at), ttl)
+        return value
+    finally:
+        if locked:
+            flight.lock.release()
+
+
+def _add_validators(response, etag):
+    response.set_etag(etag)
+    # Clients may keep the response but must check the ETag before reusing it
+    response.headers["Cache-Control"] = "no-cache"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _matching_etag(etag):
+    """The client's copy of this response, in whichever coding it has it"""
+    for tag in (etag, *(encoded_etag(etag, encoding) for encoding in ENCODINGS)):
+        if request.if_none_match.contains_weak(tag):
+            return tag
+    return None
+
+
+def cached_response(*tags, timeout=None):
+    """
+    Cache a GET view's 200 responses until one of tags is invalidated or
+    timeout (RESPONSE_CACHE_TIMEOUT by default) runs out, and answer a
+    matching If-None-Match with 304. Place it below token_required so
+    authentication still runs on every request.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = _cache_key(tags)
+            etag = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+            matched = _matching_etag(etag)
+            if matched:
+                response = current_app.response_class(status=304)
+                return _add_validators(response, matched)
+
+            def render():
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    return response.get_data(), response.mimetype
+                return response
+
+            cache_timeout = timeout
+            if cache_timeout is None:
+                cache_timeout = current_app.config.get("RESPONSE_CACHE_TIMEOUT", 300)
+            result = get_or_compute(
+                key, render, cache_timeout, cacheable=lambda r: isinstance(r, tuple)
+            )
+            if not isinstance(result, tuple):
+                return result
+
+            body, mimetype = result
+            response = current_app.response_class(body, 200, mimetype=mimetype)
+            _add_validators(response, etag)
+
+            encoding = negotiate_encoding(mimetype, len(body))
+            if encoding:
+                compressed = get_or_compute(
+                    f"{key}:{encoding}",
+                    lambda: compress(body, encoding),
+                    cache_timeout,
+                )
+                set_encoded_body(response, compressed, encoding)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def _table_tag(table):
+    return TABLE_TAGS.get(table.name, table.name)
+
+
+@event.listens_for(Session, "after_begin")
+def _track_session_writes(session, transaction, connection):
+    # Writes on this connection are recorded on the session until it commits
+    connection.info["changed_tags"] = session.info.setdefault("changed_tags", set())
+
+
+@event.listens_for(Engine, "after_execute")
+def _collect_written_table(conn, clauseelement, multiparams, params, options, result):
+    # Sees flushes as well as insert()/update()/delete() statements
+    tags = conn.info.get("changed_tags")
+    if tags is not None and getattr(clauseelement, "is_dml", False):
+        tags.add(_table_tag(clauseelement.table))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tags(session):
+    tags = session.info.pop("changed_tags", None)
+    if tags and has_app_context():
+        invalidate(*tags)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tags(session):
+    session.info.pop("changed_tags", None)
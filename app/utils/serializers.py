@@ -0,0 +1,187 @@
+# app/utils/serializers.py
+# Precompiled dump functions for marshmallow schemas on hot read paths.
+#
+# Schema.dump() looks up, checks and calls every field of every row through
+# several layers of indirection. compile_dump() reads the schema's dump fields
+# once and generates a plain function building the same dict with attribute
+# reads and inline conversions. Fields it doesn't know how to inline fall
+# back to field.serialize(), so the output always matches schema.dump().
+import datetime
+import json
+from flask import current_app
+from marshmallow import fields, missing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Field types whose _serialize is reproduced inline, with the conversion
+# applied to a non-None value. Subclasses overriding _serialize are excluded.
+_INLINE_CONVERSIONS = {
+    fields.Integer: "int",
+    fields.Float: "float",
+    fields.String: "str",
+}
+
+
+def _has_dump_hooks(schema):
+    return any(
+        schema._hooks[(tag, pass_many)]
+        for tag in ("pre_dump", "post_dump")
+        for pass_many in (True, False)
+    )
+
+
+def _inline_conversion(field):
+    for field_type, conversion in _INLINE_CONVERSIONS.items():
+        if (
+            isinstance(field, field_type)
+            and type(field)._serialize is field_type._serialize
+        ):
+            if isinstance(field, fields.Number) and field.as_string:
+                return None
+            return conversion
+    if (
+        isinstance(field, fields.Date)
+        and type(field)._serialize is fields.Date._serialize
+        and field.format in (None, "iso")
+    ):
+        return "isoformat"
+    return None
+
+
+def _model_has(schema, attribute):
+    model = getattr(getattr(schema, "opts", None), "model", None)
+    return model is not None and hasattr(model, attribute)
+
+
+def compile_dump(schema):
+    """
+    A function dumping one object exactly like schema.dump(obj) with
+    many=False, generated from schema.dump_fields.
+    """
+    if _has_dump_hooks(schema):
+        return lambda obj: schema.dump(obj, many=False)
+
+    namespace = {"missing": missing}
+    items = []
+    fallbacks = []
+
+    for i, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key or name
+        attribute = field.attribute or name
+        getter = f"obj.{attribute}" if attribute.isidentifier() else None
+
+        if (
+            getter
+            and isinstance(field, fields.Nested)
+            and _model_has(schema, attribute)
+        ):
+            nested = field.schema
+            namespace[f"nested_{i}"] = compile_dump(nested)
+            if field.many or nested.many:
+                expr = f"[nested_{i}(x) for x in v] if (v := {getter}) is not None else None"
+            else:
+                expr = f"nested_{i}(v) if (v := {getter}) is not None else None"
+            items.append((key, expr))
+            continue
+
+        conversion = _inline_conversion(field)
+        if getter and conversion and _model_has(schema, attribute):
+            if conversion == "isoformat":
+                expr = f"v.isoformat() if (v := {getter}) is not None else None"
+            else:
+                expr = f"{conversion}(v) if (v := {getter}) is not None else None"
+            items.append((key, expr))
+            continue
+
+        namespace[f"field_{i}"] = field
+        fallbacks.append((key, name, f"field_{i}"))
+
+    lines = ["def dump(obj):", "    out = {"]
+    lines += [f"        {key!r}: {expr}," for key, expr in items]
+    lines.append("    }")
+    for key, name, field_var in fallbacks:
+        field = namespace[field_var]
+        indent = "    "
+        if field.dump_default is missing and (field.attribute or name).isidentifier():
+            # Usually not set on the object at all (e.g. load-only inputs)
+            lines.append(f"    if hasattr(obj, {field.attribute or name!r}):")
+            indent = "        "
+        lines.append(f"{indent}v = {field_var}.serialize({name!r}, obj)")
+        lines.append(f"{indent}if v is not missing:")
+        lines.append(f"{indent}    out[{key!r}] = v")
+    lines.append("    return out")
+
+    exec("\n".join(lines), namespace)
+    return namespace["dump"]
+
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """JSON bytes with sorted keys, the same document Flask's jsonify produces"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(
+        data, default=_default, sort_keys=True, separators=(",", ":")
+    ).encode()
+
+
+def json_response(data, status=200):
+    return current_app.response_class(
+        dumps(data) + b"\n", status, mimetype="application/json"
+    )
+
+
+class CompiledSerializer:
+    """
+    Drop-in for a schema's dump() and jsonify() on read endpoints.
+    The dump function is generated on first use, once every schema a
+    Nested field refers to by name has been registered.
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._dump_one = None
+        self._narrowed = {}
+
+    def only(self, fields):
+        """
+        Serializer dumping just fields (a frozenset, None for all of them),
+        built once per field set
+        """
+        if fields is None:
+            return self
+        narrowed = self._narrowed.get(fields)
+        if narrowed is None:
+            schema = self.schema
+            only = fields if schema.only is None else fields & set(schema.only)
+            narrowed = CompiledSerializer(
+                type(schema)(
+                    only=only,
+                    exclude=schema.exclude,
+                    many=schema.many,
+                    context=schema.context,
+                    load_only=schema.load_only,
+                    dump_only=schema.dump_only,
+                )
+            )
+            self._narrowed[fields] = narrowed
+        return narrowed
+
+    def dump(self, obj, many=None):
+        if self._dump_one is None:
+            self._dump_one = compile_dump(self.schema)
+        many = self.schema.many if many is None else many
+        if many:
+            return [self._dump_one(o) for o in obj]
+        return self._dump_one(obj)
+
+    def jsonify(self, obj, many=None, status=200):
+        return json_response(self.dump(obj, many=many), status)
@@ -1,15 +1,71 @@
 # app/utils/util.py
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from jose import jwt, exceptions as jose_exceptions
 from functools import wraps
-from flask import request, jsonify
+from flask import abort, make_response, request, jsonify
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
 from app.models import db, Customer, Mechanic
+from app.utils.ttl_cache import TTLCache
 import os
 
 SECRET_KEY = os.environ.get("SECRET_KEY") or "super secret secrets"
 # or statement is for testing,
 # github will use the or for testing purposes because it wont have the actual key
 
+ROLE_MODELS = {"customer": Customer, "mechanic": Mechanic}
+
+# (role, user_uuid) -> (user id, token_version), so authenticated requests
+# don't need a user lookup just to compare token versions
+token_version_cache = TTLCache(
+    maxsize=int(os.environ.get("TOKEN_CACHE_SIZE", 10000)),
+    ttl=int(os.environ.get("TOKEN_CACHE_TTL", 30)),
+)
+
+
+# sha256(token) -> claims of tokens whose signature was already checked,
+# each entry expiring no later than the token's own exp claim
+verified_token_cache = TTLCache(
+    maxsize=int(os.environ.get("VERIFIED_TOKEN_CACHE_SIZE", 10000)),
+    ttl=int(os.environ.get("VERIFIED_TOKEN_CACHE_TTL", 300)),
+)
+
+
+def invalidate_token_version(role, user_uuid):
+    token_version_cache.pop((role, user_uuid))
+
+
+class LazyUser:
+    """Handle for the authenticated user, only loaded once a route touches it."""
+
+    def __init__(self, model, user_id, user=None):
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_user_id", user_id)
+        object.__setattr__(self, "_user", user)
+
+    def load(self):
+        if self._user is None:
+            user = db.session.get(self._model, self._user_id)
+            if user is None:
+                # Deleted since its token version was cached
+                abort(
+                    make_response(jsonify({"message": "Token is no longer valid"}), 401)
+                )
+            object.__setattr__(self, "_user", user)
+        return self._user
+
+    @property
+    def id(self):
+        return self._user_id
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.load(), name, value)
+
 
 def encode_token(user_uuid, role, token_version):
     """Encode JWT using user_uuid and token_version instead of user_id"""
@@ -23,6 +79,24 @@ def encode_token(user_uuid, role, token_version):
     return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
 
 
+def decode_token(token, use_cache=True):
+    """Verify a JWT and return its claims, skipping verification for repeat tokens"""
+    if not use_cache:
+        return jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+
+    key = hashlib.sha256(token.encode()).digest()
+    claims = verified_token_cache.get(key)
+    if claims is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+        # Past exp the entry is gone and jwt.decode reports the expiry
+        remaining = claims.get("exp", 0) - time.time()
+        if remaining > 0:
+            verified_token_cache.set(
+                key, claims, ttl=min(remaining, verified_token_cache.ttl)
+            )
+    return claims
+
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -42,20 +116,31 @@ def token_required(f):
         token = parts[1]
 
         try:
-            data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
+            data = decode_token(token)
             user_uuid = data.get("user_uuid")
             user_role = data.get("role")
             token_version = data.get("token_version", 0)
 
-            # Fetch user by role and UUID
-            if user_role == "customer":
-                user = db.session.query(Customer).filter_by(user_uuid=user_uuid).first()
-            elif user_role == "mechanic":
-                user = db.session.query(Mechanic).filter_by(user_uuid=user_uuid).first()
-            else:
+            model = ROLE_MODELS.get(user_role)
+            if model is None:
                 return jsonify({"message": "Invalid role in token"}), 401
 
-            if not user or token_version != user.token_version:
+            cached = token_version_cache.get((user_role, user_uuid))
+            if cached is not None:
+                user_id, current_version = cached
+                user = LazyUser(model, user_id)
+            else:
+                # Fetch user by role and UUID
+                found = db.session.query(model).filter_by(user_uuid=user_uuid).first()
+                if not found:
+                    return jsonify({"message": "Token is no longer valid"}), 401
+                current_version = found.token_version
+                token_version_cache.set(
+                    (user_role, user_uuid), (found.id, current_version)
+                )
+                user = LazyUser(model, found.id, found)
+
+            if token_version != current_version:
                 return jsonify({"message": "Token is no longer valid"}), 401
 
         except jose_exceptions.ExpiredSignatureError:
@@ -80,3 +165,40 @@ def roles_required(allowed_roles):
         return decorated
 
     return decorator
+
+
+def _role_for(target):
+    return "customer" if isinstance(target, Customer) else "mechanic"
+
+
+# Evicting at flush time would let a request between the flush and the
+# commit cache the old committed version again, so the keys are collected
+# on the session and evicted once the change is committed.
+@event.listens_for(Customer, "after_delete")
+@event.listens_for(Mechanic, "after_delete")
+def _user_deleted(mapper, connection, target):
+    _mark_stale(target)
+
+
+@event.listens_for(Customer, "after_update")
+@event.listens_for(Mechanic, "after_update")
+def _user_updated(mapper, connection, target):
+    if inspect(target).attrs.token_version.history.has_changes():
+        _mark_stale(target)
+
+
+def _mark_stale(target):
+    session = inspect(target).session
+    stale = session.info.setdefault("stale_token_versions", set())
+    stale.add((_role_for(target), target.user_uuid))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_token_versions(session):
+    for role, user_uuid in session.info.pop("stale_token_versions", ()):
+        invalidate_token_version(role, user_uuid)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_token_versions(session):
+    session.info.pop("stale_token_versions", None)
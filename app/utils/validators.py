@@ -0,0 +1,298 @@
+# app/utils/validators.py
+# Precompiled request payload validation for hot write endpoints.
+#
+# Schema.load() sends every field through deserialize(), every hook through
+# getattr() and every result through the error store on each request.
+# compile_load() reads the schema's load fields and hooks once and generates
+# a plain function checking one payload with inline type checks, calling the
+# field validators and @validates hooks directly. Field types it can't inline
+# go through field.deserialize(), payloads it can't handle through
+# schema.load() itself, so results and error messages always match.
+#
+# CompiledValidator splits validation in two phases. Hooks for the fields listed
+# in batched look rows up in the database, they run after every item of the
+# payload has been checked and its ids queued on the request's IdentityLoader,
+# so a whole batch costs one IN query per model.
+from marshmallow import RAISE, ValidationError, fields, missing, validate
+from marshmallow.error_store import SCHEMA, merge_errors
+from app.utils.loaders import get_loader
+
+
+def _store(errors, messages, field_name=SCHEMA):
+    """Add messages to errors the way marshmallow's ErrorStore does"""
+    if field_name != SCHEMA or not isinstance(messages, dict):
+        messages = {field_name: messages}
+    return merge_errors(errors, messages)
+
+
+def _overrides(field, field_type, *methods):
+    return any(
+        getattr(type(field), method) is not getattr(field_type, method)
+        for method in methods
+    )
+
+
+def _inline_check(field):
+    """A condition on v under which field.deserialize(v) returns v unchanged"""
+    if isinstance(field, fields.Integer) and not _overrides(
+        field, fields.Integer, "_deserialize", "_validated", "_format_num"
+    ):
+        return "type(v) is int"
+    if isinstance(field, fields.String) and not _overrides(
+        field, fields.String, "_deserialize"
+    ):
+        return "type(v) is str"
+    if (
+        isinstance(field, fields.List)
+        and not _overrides(field, fields.List, "_deserialize")
+        and not field.inner.validators
+        and _inline_check(field.inner) == "type(v) is int"
+    ):
+        return "type(v) is list and all(type(x) is int for x in v)"
+    return None
+
+
+def _length_check(validators):
+    """The Length validators as a condition on v, None if there are others"""
+    conditions = []
+    for validator in validators:
+        if type(validator) is not validate.Length or validator.equal is not None:
+            return None
+        if validator.min is not None:
+            conditions.append(f"len(v) >= {validator.min!r}")
+        if validator.max is not None:
+            conditions.append(f"len(v) <= {validator.max!r}")
+    return " and ".join(conditions)
+
+
+def _hook(schema, name, tag):
+    return getattr(schema, name).__marshmallow_hook__[tag]
+
+
+def _compilable(schema):
+    if schema.unknown != RAISE or not schema.opts.index_errors:
+        return False
+    for tag in ("pre_load", "post_load", "validates_schema"):
+        if schema._hooks[(tag, True)]:
+            return False
+        if any(
+            _hook(schema, name, (tag, False)).get("pass_original")
+            for name in schema._hooks[(tag, False)]
+        ):
+            return False
+    return all(
+        "." not in (field.attribute or name)
+        for name, field in schema.load_fields.items()
+    )
+
+
+def _field_hooks(schema):
+    """(field key, result attribute, bound hook) for each @validates hook"""
+    hooks = []
+    for name in schema._hooks["validates"]:
+        field_name = _hook(schema, name, "validates")["field_name"]
+        field = schema.fields.get(field_name)
+        if field is None:
+            # Declared on a parent schema, excluded from this one
+            continue
+        key = field.data_key if field.data_key is not None else field_name
+        hooks.append((key, field.attribute or field_name, getattr(schema, name)))
+    return hooks
+
+
+def compile_load(schema, deferred=()):
+    """
+    A function check(data, partial) returning (result, errors) for one dict
+    payload, like schema.load(data, partial=partial) before its schema-level
+    validators run. @validates hooks on the fields in deferred are left out.
+    """
+    namespace = {
+        "missing": missing,
+        "ValidationError": ValidationError,
+        "store": _store,
+        "UNKNOWN": schema.error_messages["unknown"],
+    }
+    lines = ["def check(data, partial):"]
+    for i, name in enumerate(schema._hooks[("pre_load", False)]):
+        namespace[f"pre_load_{i}"] = getattr(schema, name)
+        lines.append(f"    data = pre_load_{i}(data, many=False, partial=partial)")
+    lines += ["    out = {}", "    errors = {}"]
+
+    known = set()
+    for i, (name, field) in enumerate(schema.load_fields.items()):
+        key = field.data_key if field.data_key is not None else name
+        attribute = field.attribute or name
+        known.add(key)
+        namespace[f"field_{i}"] = field
+
+        check = _inline_check(field)
+        validated = not field.validators
+        if check and not validated:
+            # Payloads failing the condition get their errors from deserialize()
+            length_check = _length_check(field.validators)
+            if length_check is not None:
+                check = f"{check} and {length_check}"
+                validated = True
+        lines.append(f"    v = data.get({key!r}, missing)")
+        lines.append("    if v is missing and partial:")
+        lines.append("        pass")
+        if check:
+            lines.append(f"    elif {check}:")
+            if not validated:
+                lines.append("        try:")
+                lines.append(f"            field_{i}._validate(v)")
+                lines.append(f"            out[{attribute!r}] = v")
+                lines.append("        except ValidationError as error:")
+                lines.append(f"            errors[{key!r}] = error.messages")
+            else:
+                lines.append(f"        out[{attribute!r}] = v")
+        lines.append("    else:")
+        lines.append("        try:")
+        lines.append(f"            v = field_{i}.deserialize(v, {key!r}, data)")
+        lines.append("            if v is not missing:")
+        lines.append(f"                out[{attribute!r}] = v")
+        lines.append("        except ValidationError as error:")
+        lines.append(f"            errors[{key!r}] = error.messages")
+
+    namespace["KNOWN"] = frozenset(known)
+    lines.append("    for key in data.keys() - KNOWN:")
+    lines.append("        errors = store(errors, [UNKNOWN], key)")
+
+    for i, (key, attribute, hook) in enumerate(_field_hooks(schema)):
+        if attribute in deferred:
+            continue
+        namespace[f"hook_{i}"] = hook
+        lines.append(f"    if {attribute!r} in out:")
+        lines.append("        try:")
+        lines.append(f"            hook_{i}(out[{attribute!r}])")
+        lines.append("        except ValidationError as error:")
+        lines.append(f"            errors = store(errors, error.messages, {key!r})")
+    lines.append("    return out, errors")
+
+    exec("\n".join(lines), namespace)
+    return namespace["check"]
+
+
+class CompiledValidator:
+    """
+    Drop-in for a schema's load() on write endpoints.
+    batched maps field names to the model their @validates hook looks up,
+    e.g. {"customer_id": Customer}.
+    """
+
+    def __init__(self, schema, batched=None):
+        self.schema = schema
+        self.batched = dict(batched or {})
+        self._check = None
+
+    def _compiled(self):
+        if self._check is None:
+            self._check = False
+            if _compilable(self.schema):
+                self._check = compile_load(self.schema, deferred=self.batched)
+        return self._check
+
+    def load(self, data, many=None, partial=None):
+        """schema.load(data), same result and same ValidationError messages"""
+        many = self.schema.many if many is None else bool(many)
+        partial = self.schema.partial if partial is None else partial
+        items = data if many else [data]
+
+        if (
+            not self._compiled()
+            or partial not in (None, True, False)
+            or not isinstance(items, list)
+            or not all(isinstance(item, dict) for item in items)
+        ):
+            return self.schema.load(data, many=many, partial=partial)
+
+        results, errors = self._load(items, bool(partial), many)
+        if errors:
+            raise ValidationError(
+                errors if many else errors[0],
+                data=data,
+                valid_data=results if many else results[0],
+            )
+        return results if many else results[0]
+
+    def load_batch(self, items, partial=False):
+        """
+        Load a list of payloads as if each went through load() on its own.
+        Returns (results, errors), errors keyed by the item's index.
+        """
+        if not self._compiled():
+            results, errors = [], {}
+            for index, item in enumerate(items):
+                try:
+                    results.append(self.schema.load(item, partial=partial))
+                except ValidationError as e:
+                    errors[index] = e.messages
+            return results, errors
+
+        results, errors = [], {}
+        payloads = {}
+        for index, item in enumerate(items):
+            if isinstance(item, dict):
+                payloads[index] = item
+            else:
+                errors[index] = {SCHEMA: [self.schema.error_messages["type"]]}
+
+        loaded, failed = self._load(list(payloads.values()), partial, many=False)
+        for position, index in enumerate(payloads):
+            if position in failed:
+                errors[index] = failed[position]
+            else:
+                results.append(loaded[position])
+        return results, errors
+
+    def _load(self, items, partial, many):
+        schema = self.schema
+        checked = [self._check(item, partial) for item in items]
+
+        # Second phase: queue every id first so the hooks share one query
+        deferred = [hook for hook in _field_hooks(schema) if hook[1] in self.batched]
+        for attribute, model in self.batched.items():
+            loader = get_loader(model)
+            for out, _ in checked:
+                value = out.get(attribute)
+                loader.prime(value if isinstance(value, list) else [value])
+
+        results, errors = [], {}
+        for index, (out, item_errors) in enumerate(checked):
+            for key, attribute, hook in deferred:
+                if attribute in out:
+                    try:
+                        hook(out[attribute])
+                    except ValidationError as error:
+                        item_errors = _store(item_errors, error.messages, key)
+            results.append(out)
+            if item_errors:
+                errors[index] = item_errors
+
+        # Schema-level validators, skipped by default when a field failed
+        # (for many=True, when a field of any item failed)
+        field_errors = set(errors)
+        for name in schema._hooks[("validates_schema", False)]:
+            hook = getattr(schema, name)
+            options = _hook(schema, name, ("validates_schema", False))
+            for index, out in enumerate(results):
+                if options["skip_on_field_errors"] and (
+                    field_errors if many else index in field_errors
+                ):
+                    continue
+                try:
+                    hook(out, partial=partial, many=many)
+                except ValidationError as error:
+                    errors[index] = _store(
+                        errors.get(index, {}), error.messages, error.field_name
+                    )
+
+        if many and errors:
+            return results, errors
+        for name in schema._hooks[("post_load", False)]:
+            hook = getattr(schema, name)
+            results = [
+                out if index in errors else hook(out, many=many, partial=partial)
+                for index, out in enumerate(results)
+            ]
+        return results, errors
@@ -0,0 +1,67 @@
+# benchmarks/bench_serializers.py
+# Compares marshmallow dump + jsonify with the compiled serializer on
+# 10k service tickets, each with two mechanics and one part.
+# python -m benchmarks.bench_serializers
+import os
+import timeit
+from datetime import date
+
+os.environ.setdefault("CI", "true")
+
+from flask import jsonify
+
+from app import create_app
+from app.blueprints.service_tickets.schemas import (
+    service_tickets_schema,
+    service_tickets_serializer,
+)
+from app.models import InventoryServiceTicket, Mechanic, ServiceTicket
+
+TICKETS = 10000
+ROUNDS = 5
+
+
+def make_tickets():
+    mechanics = [
+        Mechanic(id=i, name=f"Mechanic {i}", email=f"m{i}@shop.com") for i in range(5)
+    ]
+    return [
+        ServiceTicket(
+            id=i,
+            customer_id=i % 100,
+            VIN="1HGCM82633A123456",
+            service_date=date(2030, 12, 10),
+            service_desc="replace front brake pads, squeal on left",
+            mechanics=[mechanics[i % 5], mechanics[(i + 1) % 5]],
+            inventory_links=[
+                InventoryServiceTicket(inventory_id=i % 50, quantity_used=2)
+            ],
+        )
+        for i in range(TICKETS)
+    ]
+
+
+def main():
+    app = create_app("TestingConfig")
+    tickets = make_tickets()
+
+    with app.test_request_context():
+        marshmallow_body = jsonify(service_tickets_schema.dump(tickets)).get_json()
+        compiled_body = service_tickets_serializer.jsonify(tickets).get_json()
+        assert compiled_body == marshmallow_body
+
+        marshmallow = timeit.timeit(
+            lambda: jsonify(service_tickets_schema.dump(tickets)), number=ROUNDS
+        )
+        compiled = timeit.timeit(
+            lambda: service_tickets_serializer.jsonify(tickets), number=ROUNDS
+        )
+
+    print(f"tickets per response: {TICKETS}")
+    print(f"marshmallow + jsonify: {marshmallow / ROUNDS * 1e3:8.1f} ms/response")
+    print(f"compiled + orjson:     {compiled / ROUNDS * 1e3:8.1f} ms/response")
+    print(f"speedup:               {marshmallow / compiled:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# benchmarks/bench_token_decode.py
+# Compares JWT decode cost with the verified-token cache on and off.
+# python -m benchmarks.bench_token_decode
+import timeit
+
+from app.utils.utils import decode_token, encode_token, verified_token_cache
+
+ROUNDS = 20000
+
+
+def main():
+    token = encode_token("bench-user-uuid", "mechanic", 1)
+    verified_token_cache.clear()
+
+    uncached = timeit.timeit(
+        lambda: decode_token(token, use_cache=False), number=ROUNDS
+    )
+    cached = timeit.timeit(lambda: decode_token(token), number=ROUNDS)
+
+    print(f"decodes per run: {ROUNDS}")
+    print(f"cache off: {uncached / ROUNDS * 1e6:8.2f} us/decode")
+    print(f"cache on:  {cached / ROUNDS * 1e6:8.2f} us/decode")
+    print(f"speedup:   {uncached / cached:8.1f}x")
+    print(f"cache stats: {verified_token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
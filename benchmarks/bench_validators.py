@@ -0,0 +1,130 @@
+# benchmarks/bench_validators.py
+# Compares ServiceTicketSchema.load with the compiled validator on single
+# ticket payloads and on a 500 ticket bulk request, and update-parts lists
+# through InventoryServiceTicketSchema.
+# python -m benchmarks.bench_validators
+import copy
+import os
+import timeit
+
+os.environ.setdefault("CI", "true")
+
+from app import create_app
+from app.blueprints.inventories.schemas import (
+    inventories_service_ticket_schema,
+    inventories_service_ticket_validator,
+)
+from app.blueprints.service_tickets.schemas import (
+    service_ticket_schema,
+    service_ticket_validator,
+)
+from app.models import Customer, Mechanic, db
+from app.utils.loaders import get_loader
+
+CUSTOMERS = 100
+MECHANICS = 20
+BULK_TICKETS = 500
+SINGLE_ROUNDS = 2000
+BULK_ROUNDS = 10
+
+
+def make_tickets(count):
+    return [
+        {
+            "customer_id": i % CUSTOMERS + 1,
+            "VIN": " 1hgcm82633a123456 ",
+            "service_date": "2030-12-10",
+            "service_desc": "replace front brake pads, squeal on left",
+            "mechanic_ids": [i % MECHANICS + 1, (i + 1) % MECHANICS + 1],
+        }
+        for i in range(count)
+    ]
+
+
+def marshmallow_bulk(payload):
+    # What the bulk route did before: queue the ids, then load each ticket
+    for item in payload:
+        get_loader(Customer).prime([item["customer_id"]])
+        get_loader(Mechanic).prime(item["mechanic_ids"])
+    return [service_ticket_schema.load(item) for item in payload]
+
+
+def timed(app, load, payload, rounds):
+    """Seconds per request, each in a new request context so ids are looked up"""
+    # pre_load strips strings in place, every round gets its own copy
+    payloads = [copy.deepcopy(payload) for _ in range(rounds)]
+
+    def run():
+        for item in payloads:
+            with app.test_request_context():
+                load(item)
+
+    return timeit.timeit(run, number=1) / rounds
+
+
+def make_app():
+    app = create_app("TestingConfig")
+    with app.app_context():
+        db.create_all()
+        db.session.add_all(
+            Customer(
+                name=f"Customer {i}",
+                email=f"c{i}@shop.com",
+                phone=f"333-333-{i:04d}",
+                password="password",
+            )
+            for i in range(CUSTOMERS)
+        )
+        db.session.add_all(
+            Mechanic(
+                name=f"Mechanic {i}",
+                email=f"m{i}@shop.com",
+                phone=f"444-444-{i:04d}",
+                password="password",
+                salary=50000,
+            )
+            for i in range(MECHANICS)
+        )
+        db.session.commit()
+    return app
+
+
+def main():
+    app = make_app()
+    single = make_tickets(1)
+    bulk = make_tickets(BULK_TICKETS)
+    parts = [{"inventory_id": i, "quantity_used": 2} for i in range(1, 21)]
+
+    with app.test_request_context():
+        assert service_ticket_validator.load_batch(copy.deepcopy(bulk)) == (
+            marshmallow_bulk(copy.deepcopy(bulk)),
+            {},
+        )
+
+    results = [
+        (
+            "single ticket",
+            timed(app, service_ticket_schema.load, single[0], SINGLE_ROUNDS),
+            timed(app, service_ticket_validator.load, single[0], SINGLE_ROUNDS),
+        ),
+        (
+            f"{BULK_TICKETS} ticket bulk",
+            timed(app, marshmallow_bulk, bulk, BULK_ROUNDS),
+            timed(app, service_ticket_validator.load_batch, bulk, BULK_ROUNDS),
+        ),
+        (
+            f"{len(parts)} part update",
+            timed(app, inventories_service_ticket_schema.load, parts, SINGLE_ROUNDS),
+            timed(app, inventories_service_ticket_validator.load, parts, SINGLE_ROUNDS),
+        ),
+    ]
+
+    for name, marshmallow, compiled in results:
+        print(f"{name}:")
+        print(f"  marshmallow: {marshmallow * 1e6:10.1f} us/request")
+        print(f"  compiled:    {compiled * 1e6:10.1f} us/request")
+        print(f"  speedup:     {marshmallow / compiled:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
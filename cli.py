@@ -1,6 +1,12 @@
 import click
 from app import create_app
 from app.models import db
+from app.migrations import upgrade_db
+from app.blueprints.inventories.importer import (
+    IMPORT_CHUNK_SIZE,
+    ROW_READERS,
+    import_parts,
+)
 
 app = create_app("DevelopmentConfig")
 
@@ -14,7 +20,45 @@ def reset_db():
     click.echo("Database has been reset ✅")
 
 
+@app.cli.command("upgrade-db")
+def upgrade_db_command():
+    """Creates missing tables and applies pending schema migrations."""
+    ran = upgrade_db()
+    if ran:
+        for version in ran:
+            click.echo(f"Applied {version}")
+    else:
+        click.echo("Database is up to date")
+
+
+@app.cli.command("import-parts")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--format",
+    "file_format",
+    type=click.Choice(sorted(ROW_READERS)),
+    help="Defaults to the file extension (.csv, .ndjson or .jsonl).",
+)
+@click.option("--chunk-size", default=IMPORT_CHUNK_SIZE, show_default=True)
+def import_parts_command(path, file_format, chunk_size):
+    """Upserts inventory parts from a CSV or NDJSON supplier catalog."""
+    if file_format is None:
+        file_format = "csv" if path.lower().endswith(".csv") else "ndjson"
+
+    with open(path, "rb") as stream:
+        result = import_parts(ROW_READERS[file_format](stream), chunk_size)
+
+    click.echo(
+        f"Imported parts: {result['inserted']} inserted, "
+        f"{result['updated']} updated, {result['failed']} failed"
+    )
+    for error in result["errors"]:
+        click.echo(f"  line {error['line']}: {error['errors']}")
+
+
 # to use the command:
 # make sure its active source venv/bin/activate
 # export FLASK_APP=cli.py
 # flask reset-db
+# flask upgrade-db
+# flask import-parts catalog.csv
@@ -1,5 +1,6 @@
 from app import create_app
 from app.models import db
+from app.migrations import upgrade_db
 
 app = create_app("ProductionConfig")
 # Start virtual environment for Mac
@@ -17,7 +18,8 @@ app = create_app("ProductionConfig")
 
 with app.app_context():
     # db.drop_all()
-    db.create_all()
+    # Creates missing tables too, one worker at a time
+    upgrade_db()
 
 # do not need this because gunicorn, app.run()
 